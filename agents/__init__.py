@@ -0,0 +1 @@
+"""Gemini-powered agents for the Letta environment."""
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Shared Gemini setup for the agents in this directory.
+
+Loading ~/.letta/env and configuring the Gemini SDK only needs to happen once
+per process, no matter how many agents are constructed, and agents with the
+same settings can share one GenerativeModel.
+"""
+
+import os
+import logging
+import functools
+from typing import TYPE_CHECKING, Optional
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
+def get_genai():
+    """
+    Import the Gemini SDK on first use
+    
+    google.generativeai pulls in grpc and protobuf, so importing it is deferred
+    until an agent actually talks to Gemini.
+    
+    :return: The google.generativeai module
+    """
+    import google.generativeai as genai
+    return genai
+
+@functools.lru_cache(maxsize=1)
+def configure_gemini() -> None:
+    """
+    Load environment variables and configure the Gemini API (once per process)
+    
+    :raises ValueError: If GEMINI_API_KEY is not set
+    """
+    # Load environment variables
+    load_dotenv(os.path.expanduser('~/.letta/env'))
+    
+    # Configure Gemini API
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        logger.error("Gemini API key not found in environment")
+        raise ValueError("GEMINI_API_KEY must be set")
+    
+    get_genai().configure(api_key=api_key)
+
+@functools.lru_cache(maxsize=16)
+def get_model(model_name: str, 
+              system_instruction: Optional[str] = None,
+              temperature: float = 0.7,
+              max_tokens: int = 1024) -> 'genai.GenerativeModel':
+    """
+    Get a GenerativeModel, reusing an existing one for identical settings
+    
+    :param model_name: Gemini model name
+    :param system_instruction: Optional system instruction
+    :param temperature: Sampling temperature
+    :param max_tokens: Maximum output tokens
+    :return: Configured GenerativeModel
+    """
+    genai = get_genai()
+    return genai.GenerativeModel(
+        model_name,
+        generation_config=genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens
+        ),
+        system_instruction=system_instruction
+    )
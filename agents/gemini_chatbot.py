@@ -2,17 +2,80 @@
 import os
 import sys
 import json
+import math
+import time
+import array
+import queue
+import atexit
+import hashlib
+import sqlite3
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import functools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
-import google.generativeai as genai
-from dotenv import load_dotenv
+# Running as a script puts agents/ instead of the project root on sys.path;
+# package imports (python -m ...) resolve through the normal finders
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents._gemini_bootstrap import configure_gemini, get_genai, get_model
+
+GEMINI_MODEL = 'gemini-2.0-flash'
+
+# Explicit context caching: Gemini rejects caches below a minimum token count
+# (4096 for gemini-2.0-flash), so history is only moved into the cached prefix
+# once it is large enough.
+CACHE_MIN_TOKENS = 4096
+CACHE_TTL_SECONDS = 60 * 60
+# Explicit caches must be created against a fixed model version
+CACHE_MODEL = 'models/gemini-2.0-flash-001'
+# Number of committed-but-uncached turns (user + model pairs) before the cache is rebuilt
+CACHE_COMMIT_TURNS = 4
+# Recent history entries kept outside the committed prefix
+RECENT_HISTORY_SIZE = 8
+
+# Semantic response cache: responses are only reused for near-identical inputs in
+# the same recent context, and never when sampling is too random to be repeatable
+SEMANTIC_CACHE_THRESHOLD = 0.85
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.3
+# Cached responses expire after a week, and the table is capped at a fixed number of rows
+SEMANTIC_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+SEMANTIC_CACHE_MAX_ROWS = 5000
+EMBEDDING_MODEL = 'models/text-embedding-004'
+
+# Compact serialization for every memory write (no pretty-printing on the hot path).
+# Keys are sorted so identical entries always produce identical bytes.
+try:
+    import orjson
+    
+    def _encode_memory(memory_entry: Dict[str, Any]) -> bytes:
+        return orjson.dumps(memory_entry, option=orjson.OPT_SORT_KEYS)
+    
+    _loads = orjson.loads
+except ImportError:
+    _MEMORY_ENCODER = json.JSONEncoder(separators=(',', ':'), sort_keys=True)
+    
+    def _encode_memory(memory_entry: Dict[str, Any]) -> bytes:
+        return _MEMORY_ENCODER.encode(memory_entry).encode('utf-8')
+    
+    # json.loads accepts the raw bytes as well
+    _loads = json.loads
 
 class LettaMemoryManager:
     """
     Manages memory storage for Letta chatbot interactions
+    
+    Writes are queued and performed by a background thread so the chat
+    response path never waits on disk I/O.
     """
+    # Maximum number of queued operations applied per batch, and how long the
+    # writer waits for more work before flushing a partial batch
+    BATCH_SIZE = 32
+    BATCH_TIMEOUT = 0.05
+    
     def __init__(self, memory_dir: str = None):
         """
         Initialize memory storage
@@ -21,24 +84,30 @@ class LettaMemoryManager:
         """
         self.memory_dir = memory_dir or os.path.expanduser('~/.letta/memories')
         os.makedirs(self.memory_dir, exist_ok=True)
+        
+        # Pending (operation, filepath, data) tuples, applied in order
+        self._queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._drain, daemon=True).start()
+        atexit.register(self.flush)
     
     def store_memory(self, 
                      topic: str, 
                      content: Dict[str, Any], 
-                     tags: List[str] = None) -> bool:
+                     tags: List[str] = None) -> Optional[str]:
         """
-        Store a memory entry in Letta's memory system
+        Queue a memory entry for storage in Letta's memory system
         
         :param topic: Topic of the memory
         :param content: Content to be stored
         :param tags: Optional tags for the memory
-        :return: Whether memory was successfully stored
+        :return: Path the memory will be stored at, or None if it could not be queued
         """
         try:
-            # Generate unique filename
-            timestamp = datetime.now().isoformat()
-            safe_topic = ''.join(c if c.isalnum() or c in [' ', '_'] else '_' for c in topic).lower()
-            filename = f"{safe_topic}_{timestamp}.json"
+            # Generate unique filename from an integer clock; the ISO timestamp
+            # is only needed inside the entry
+            timestamp_ns = time.time_ns()
+            timestamp = datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+            filename = f"{_safe_topic(topic)}_{timestamp_ns}.json"
             filepath = os.path.join(self.memory_dir, filename)
             
             # Prepare memory entry
@@ -47,27 +116,314 @@ class LettaMemoryManager:
                 'topic': topic,
                 'timestamp': timestamp,
                 'content': content,
-                'tags': tags or []
+                # Canonical tag order keeps identical memories byte-identical
+                'tags': sorted(set(tags or []))
             }
             
-            # Write to file
-            with open(filepath, 'w') as f:
-                json.dump(memory_entry, f, indent=4)
-            
-            return True
+            self._queue.put_nowait(('store', filepath, memory_entry))
+            return filepath
         except Exception as e:
             logging.error(f"Memory storage error: {e}")
+            return None
+    
+    def update_memory(self, filepath: str, **fields) -> bool:
+        """
+        Queue an in-place update of top-level fields of a stored memory entry
+        
+        :param filepath: Path returned by store_memory
+        :param fields: Fields to overwrite (e.g. topic)
+        :return: Whether the update was queued
+        """
+        try:
+            self._queue.put_nowait(('update', filepath, fields))
+            return True
+        except Exception as e:
+            logging.error(f"Memory update error: {e}")
             return False
+    
+    def load_context(self, topic: str, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Load the most recent memories matching a topic in a deterministic order
+        
+        The k most recent matches are returned sorted by (topic, timestamp) so
+        the same underlying memories always produce the same prompt prefix.
+        
+        :param topic: Topic substring to match (case-insensitive)
+        :param k: Maximum number of memories to return
+        :return: Matching memory entries
+        """
+        # Make sure queued writes are visible
+        self.flush()
+        
+        topic = topic.lower()
+        matches = []
+        for entry in os.scandir(self.memory_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                with open(entry.path, 'rb') as f:
+                    memory = _loads(f.read())
+                # A null topic never matches; a non-object file is logged and skipped
+                if topic in str(memory.get('topic') or '').lower():
+                    matches.append(memory)
+            except Exception as e:
+                logging.error(f"Memory read error: {e}")
+        
+        matches.sort(key=lambda m: str(m.get('timestamp') or ''), reverse=True)
+        return sorted(matches[:k], key=lambda m: (str(m.get('topic') or ''), str(m.get('timestamp') or '')))
+    
+    @staticmethod
+    def format_context(memories: List[Dict[str, Any]]) -> str:
+        """
+        Serialize memories for a prompt with canonical key order and separators
+        
+        :param memories: Entries from load_context
+        :return: Byte-stable JSON text
+        """
+        return json.dumps(memories, sort_keys=True, separators=(',', ':'))
+    
+    def flush(self):
+        """
+        Block until all queued memory operations have been written
+        """
+        self._queue.join()
+    
+    def _drain(self):
+        """
+        Background writer: apply queued operations in batches
+        """
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self._queue.get(timeout=self.BATCH_TIMEOUT))
+            except queue.Empty:
+                pass
+            
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch: List[tuple]):
+        """
+        Apply a batch of operations, writing each affected file once
+        
+        :param batch: Queued (operation, filepath, data) tuples
+        """
+        # Updates to entries stored in the same batch are merged before writing
+        pending: Dict[str, Dict[str, Any]] = {}
+        for operation, filepath, data in batch:
+            try:
+                if operation == 'store':
+                    pending[filepath] = data
+                else:
+                    if filepath not in pending:
+                        with open(filepath, 'rb') as f:
+                            pending[filepath] = _loads(f.read())
+                    pending[filepath].update(data)
+            except Exception as e:
+                logging.error(f"Memory update error: {e}")
+        
+        for filepath, memory_entry in pending.items():
+            try:
+                # Serialize up front so the file receives a single write, and
+                # rename into place so readers never see a partial entry
+                payload = _encode_memory(memory_entry)
+                tmp_path = filepath + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, filepath)
+            except Exception as e:
+                logging.error(f"Memory storage error: {e}")
+
+# ASCII translation table for topic filenames: alphanumerics are lowercased,
+# space and underscore are kept, everything else becomes an underscore
+_SAFE_TOPIC_TABLE = {
+    i: (chr(i).lower() if chr(i).isalnum() or chr(i) in ' _' else '_')
+    for i in range(128)
+}
+
+def _safe_topic(topic: str) -> str:
+    """
+    Sanitize a topic for use in a memory filename
+    
+    :param topic: Memory topic
+    :return: Lowercased topic with unsafe characters replaced by underscores
+    """
+    if topic.isascii():
+        return topic.translate(_SAFE_TOPIC_TABLE)
+    # Non-ASCII alphanumerics are kept, which the ASCII table cannot express
+    return ''.join(c if c.isalnum() or c in [' ', '_'] else '_' for c in topic).lower()
+
+@functools.lru_cache(maxsize=64)
+def _build_system_instruction(persona: str) -> str:
+    """
+    Build the system instruction for a persona (shared between chatbots)
+    
+    :param persona: Personality description for the chatbot
+    :return: System instruction text
+    """
+    return f"You are a {persona}. Provide helpful, engaging, and informative responses."
+
+class SemanticResponseCache:
+    """
+    SQLite-backed cache of chatbot responses keyed by recent conversation
+    context and the embedding of the user input
+    """
+    def __init__(self, 
+                 db_path: str = None, 
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 context_window: int = 4,
+                 scope: str = '',
+                 ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+                 max_rows: int = SEMANTIC_CACHE_MAX_ROWS):
+        """
+        Initialize the response cache
+        
+        :param db_path: Custom cache database path
+        :param threshold: Minimum cosine similarity for a cache hit
+        :param context_window: Number of recent history entries that scope a lookup
+        :param scope: Settings that shape responses (model, system instruction, sampling);
+                      caches with different scopes never share entries
+        :param ttl_seconds: Age after which cached responses are pruned
+        :param max_rows: Maximum number of cached responses kept
+        """
+        self.db_path = db_path or os.path.expanduser('~/.letta/response_cache.db')
+        self.threshold = threshold
+        self.context_window = context_window
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._scope_digest = hashlib.sha256(scope.encode()).digest()
+        
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                context_key TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                norm REAL NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        # Databases from before pruning lack the column; their rows read as expired
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(responses)')}
+        if 'created' not in columns:
+            self._conn.execute('ALTER TABLE responses ADD COLUMN created REAL NOT NULL DEFAULT 0')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_responses_context ON responses(context_key)'
+        )
+        self._conn.commit()
+    
+    def context_key(self, history: List[Dict[str, Any]]) -> str:
+        """
+        Hash the most recent history entries that scope a cache lookup
+        
+        :param history: Conversation history as role/parts entries
+        :return: Context key
+        """
+        digest = hashlib.sha256(self._scope_digest)
+        for entry in history[-self.context_window:]:
+            digest.update(entry['role'].encode())
+            digest.update(b'\0')
+            digest.update(entry['parts'][0].encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _embed(text: str) -> array.array:
+        """
+        Embed text with the Gemini embedding model
+        
+        :param text: Text to embed
+        :return: Embedding vector
+        """
+        result = get_genai().embed_content(model=EMBEDDING_MODEL, content=text)
+        return array.array('f', result['embedding'])
+    
+    def get(self, user_input: str, context_key: str) -> Tuple[Optional[str], float, Optional[array.array]]:
+        """
+        Look up a cached response for the user input in the given context
+        
+        :param user_input: User's message
+        :param context_key: Key from context_key()
+        :return: (cached response or None, best similarity, input embedding for set())
+        """
+        # Exact repeats never need an embedding round-trip
+        row = self._conn.execute(
+            'SELECT response FROM responses WHERE context_key = ? AND prompt = ?',
+            (context_key, user_input)
+        ).fetchone()
+        if row:
+            return row[0], 1.0, None
+        
+        rows = self._conn.execute(
+            'SELECT embedding, norm, response FROM responses WHERE context_key = ?',
+            (context_key,)
+        ).fetchall()
+        if not rows:
+            return None, 0.0, None
+        
+        query = self._embed(user_input)
+        query_norm = math.sqrt(sum(x * x for x in query)) or 1.0
+        
+        best_response, best_sim = None, 0.0
+        for blob, norm, response in rows:
+            candidate = array.array('f')
+            candidate.frombytes(blob)
+            sim = sum(a * b for a, b in zip(query, candidate)) / (query_norm * norm)
+            if sim > best_sim:
+                best_response, best_sim = response, sim
+        
+        if best_sim >= self.threshold:
+            return best_response, best_sim, query
+        return None, best_sim, query
+    
+    def set(self, 
+            user_input: str, 
+            response: str, 
+            context_key: str, 
+            embedding: Optional[array.array] = None):
+        """
+        Cache a response for the user input in the given context
+        
+        :param user_input: User's message
+        :param response: Chatbot's response
+        :param context_key: Key from context_key()
+        :param embedding: Input embedding already computed by get(), if any
+        """
+        if embedding is None:
+            embedding = self._embed(user_input)
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        
+        now = time.time()
+        self._conn.execute(
+            'INSERT INTO responses (context_key, prompt, embedding, norm, response, created) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (context_key, user_input, embedding.tobytes(), norm, response, now)
+        )
+        # Drop expired entries, then the oldest ones beyond the row cap
+        self._conn.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl_seconds,))
+        self._conn.execute(
+            'DELETE FROM responses WHERE rowid <= '
+            '(SELECT rowid FROM responses ORDER BY rowid DESC LIMIT 1 OFFSET ?)',
+            (self.max_rows,)
+        )
+        self._conn.commit()
 
 class GeminiChatbot:
     """
     Chatbot using Google Gemini API with Letta memory integration
     """
-    def __init__(self, persona: str = "helpful assistant"):
+    def __init__(self, persona: str = "helpful assistant", temperature: float = 0.7):
         """
         Initialize chatbot with specific persona
         
         :param persona: Personality description for the chatbot
+        :param temperature: Sampling temperature for responses
         """
         # Setup logging
         logging.basicConfig(
@@ -75,32 +431,143 @@ class GeminiChatbot:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
         
-        # Load environment variables
-        load_dotenv(os.path.expanduser('~/.letta/env'))
-        
-        # Configure Gemini API
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            logging.error("Gemini API key not found")
-            raise ValueError("GEMINI_API_KEY must be set")
-        
-        genai.configure(api_key=api_key)
-        
-        # Initialize Gemini model
-        self.model = genai.GenerativeModel(
-            'gemini-2.0-flash',
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.7,
-                max_output_tokens=1024
-            ),
-            system_instruction=f"You are a {persona}. Provide helpful, engaging, and informative responses."
+        # Load environment variables and configure Gemini API (once per process)
+        configure_gemini()
+        
+        # Generation settings and system instruction are kept so the model can
+        # be rebuilt on top of a cached prefix later in the conversation
+        self.generation_config = get_genai().types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=1024
         )
+        self.system_instruction = _build_system_instruction(persona)
+        
+        # Initialize Gemini model (shared between chatbots with the same settings)
+        self.model = get_model(GEMINI_MODEL, self.system_instruction, temperature, 1024)
         
         # Initialize memory manager
         self.memory_manager = LettaMemoryManager()
         
-        # Conversation history
-        self.conversation_history: List[tuple] = []
+        # Reusing answers only makes sense when responses are near-deterministic
+        self._sem_cache = None
+        if temperature <= SEMANTIC_CACHE_MAX_TEMPERATURE:
+            try:
+                # Chatbots only share answers when every setting that shapes them matches
+                scope = '\0'.join((GEMINI_MODEL, self.system_instruction, repr(temperature), '1024'))
+                self._sem_cache = SemanticResponseCache(scope=scope)
+            except Exception as e:
+                logging.warning(f"Response cache unavailable: {e}")
+        
+        # Off-critical-path work (topic refinement) runs here after the reply is returned
+        self._background = ThreadPoolExecutor(max_workers=1)
+        
+        # Recent turns as prebuilt role/parts entries (dynamic tail)
+        self._recent: deque = deque(maxlen=RECENT_HISTORY_SIZE)
+        
+        # Older turns in an append-only, never reordered prefix; the first
+        # _cached_count entries are stored server-side with the system instruction
+        self._committed_history: List[Dict[str, Any]] = []
+        self._cached_count = 0
+        self._cache = None
+        self._cache_name: Optional[str] = None
+        self._cache_created = 0.0
+        self._cached_model = None
+        # Committed history length a failed cache creation waits for before retrying
+        self._cache_retry_at = 0
+    
+    @property
+    def conversation_history(self) -> List[tuple]:
+        """
+        Full conversation history as (role, message) tuples
+        """
+        return [
+            (entry['role'], entry['parts'][0])
+            for entry in (*self._committed_history, *self._recent)
+        ]
+    
+    @staticmethod
+    def _estimate_tokens(contents: List[Dict[str, Any]]) -> int:
+        """
+        Roughly estimate the token count of chat contents (~4 characters per token)
+        
+        :param contents: Chat contents in Gemini role/parts format
+        :return: Estimated token count
+        """
+        return sum(len(part) for entry in contents for part in entry['parts']) // 4
+    
+    def _append_turn(self, user_input: str, response_text: str):
+        """
+        Append a completed turn, committing the oldest recent turn to the prefix
+        once the recent window is full
+        
+        :param user_input: User's message
+        :param response_text: Chatbot's response
+        """
+        if len(self._recent) == RECENT_HISTORY_SIZE:
+            self._committed_history.append(self._recent.popleft())
+            self._committed_history.append(self._recent.popleft())
+        
+        self._recent.append({'role': 'user', 'parts': [user_input]})
+        self._recent.append({'role': 'model', 'parts': [response_text]})
+    
+    def _drop_cache(self):
+        """
+        Delete the current server-side cache, if any
+        """
+        if self._cache is not None:
+            try:
+                self._cache.delete()
+            except Exception as e:
+                logging.warning(f"Context cache cleanup error: {e}")
+        self._cache = None
+        self._cache_name = None
+        self._cached_model = None
+        self._cached_count = 0
+    
+    def _ensure_cache(self):
+        """
+        Create (or refresh) the explicit context cache for the system instruction
+        and committed history once it crosses the minimum cacheable size
+        
+        :return: Model bound to the cached prefix, or None if nothing is cached
+        """
+        uncached = len(self._committed_history) - self._cached_count
+        if (self._cache_name 
+                and uncached < CACHE_COMMIT_TURNS * 2 
+                and time.monotonic() - self._cache_created < CACHE_TTL_SECONDS - 60):
+            return self._cached_model
+        
+        # The cached prefix is immutable, so expired (or about to expire) caches and
+        # caches lagging too far behind the committed history are recreated
+        self._drop_cache()
+        
+        if self._estimate_tokens(self._committed_history) < CACHE_MIN_TOKENS:
+            return None
+        
+        # After a failed creation, don't block every turn on retrying it
+        if len(self._committed_history) < self._cache_retry_at:
+            return None
+        
+        try:
+            self._cache = get_genai().caching.CachedContent.create(
+                model=CACHE_MODEL,
+                system_instruction=self.system_instruction,
+                contents=self._committed_history,
+                ttl=timedelta(seconds=CACHE_TTL_SECONDS)
+            )
+            self._cache_name = self._cache.name
+            self._cache_created = time.monotonic()
+            self._cached_count = len(self._committed_history)
+            self._cached_model = get_genai().GenerativeModel.from_cached_content(
+                cached_content=self._cache,
+                generation_config=self.generation_config
+            )
+            return self._cached_model
+        except Exception as e:
+            logging.warning(f"Context cache creation failed, sending full history: {e}")
+            self._drop_cache()
+            self._cache_retry_at = len(self._committed_history) + CACHE_COMMIT_TURNS * 2
+            return None
     
     def generate_response(self, user_input: str) -> str:
         """
@@ -109,36 +576,68 @@ class GeminiChatbot:
         :param user_input: User's message
         :return: Chatbot's response
         """
+        return ''.join(self.stream_response(user_input))
+    
+    def stream_response(self, user_input: str) -> Iterator[str]:
+        """
+        Stream a response from Gemini as it is generated, then store the
+        interaction in memory once the full text is known
+        
+        :param user_input: User's message
+        :return: Iterator over response text chunks
+        """
         try:
-            # Prepare conversation context
-            chat_history = [
-                {'role': role, 'parts': [msg]} 
-                for role, msg in self.conversation_history
-            ]
-            
-            # Generate response
-            response = self.model.generate_content(
-                contents=[
-                    *chat_history,
-                    {'role': 'user', 'parts': [user_input]}
-                ]
-            )
+            # Check for a cached answer to the same question in the same context
+            response_text = None
+            if self._sem_cache is not None:
+                recent = [*self._committed_history[-self._sem_cache.context_window:], *self._recent]
+                context_key = self._sem_cache.context_key(recent)
+                try:
+                    response_text, _, embedding = self._sem_cache.get(user_input, context_key)
+                except Exception as e:
+                    logging.warning(f"Response cache lookup error: {e}")
+                    embedding = None
             
-            # Extract response text
-            response_text = response.text
+            if response_text is not None:
+                yield response_text
+            else:
+                new_turn = {'role': 'user', 'parts': [user_input]}
+                
+                # With a cached prefix only the uncached tail and the new turn are sent
+                cached_model = self._ensure_cache()
+                if cached_model is not None:
+                    response = cached_model.generate_content(
+                        contents=[*self._committed_history[self._cached_count:], *self._recent, new_turn],
+                        stream=True
+                    )
+                else:
+                    response = self.model.generate_content(
+                        contents=[*self._committed_history, *self._recent, new_turn],
+                        stream=True
+                    )
+                
+                # Hand chunks to the caller as they arrive, keeping the full text
+                pieces = []
+                for chunk in response:
+                    pieces.append(chunk.text)
+                    yield chunk.text
+                response_text = ''.join(pieces)
+                
+                if self._sem_cache is not None:
+                    try:
+                        self._sem_cache.set(user_input, response_text, context_key, embedding)
+                    except Exception as e:
+                        logging.warning(f"Response cache store error: {e}")
             
             # Store interaction in memory
             self._store_interaction(user_input, response_text)
             
             # Update conversation history
-            self.conversation_history.append(('user', user_input))
-            self.conversation_history.append(('assistant', response_text))
-            
-            return response_text
+            self._append_turn(user_input, response_text)
         
         except Exception as e:
             logging.error(f"Response generation error: {e}")
-            return "I'm sorry, but I encountered an error processing your request."
+            yield "I'm sorry, but I encountered an error processing your request."
     
     def _store_interaction(self, user_input: str, response: str):
         """
@@ -148,11 +647,9 @@ class GeminiChatbot:
         :param response: Chatbot's response
         """
         try:
-            # Determine topic based on user input
-            topic_generation = self.model.generate_content(
-                f"Summarize the main topic of this conversation in 3-5 words: {user_input}"
-            )
-            topic = topic_generation.text.strip()
+            # Cheap local topic (capped, it ends up in the filename);
+            # the LLM summary is derived in the background
+            topic = ' '.join(user_input.split()[:5])[:60].lower()
             
             # Prepare memory content
             memory_content = {
@@ -162,15 +659,37 @@ class GeminiChatbot:
             }
             
             # Store in memory with tags
-            self.memory_manager.store_memory(
+            memory_path = self.memory_manager.store_memory(
                 topic=topic or "General Conversation",
                 content=memory_content,
                 tags=['chatbot', 'interaction']
             )
+            
+            if memory_path:
+                self._background.submit(self._refine_topic, user_input, memory_path)
         
         except Exception as e:
             logging.error(f"Memory storage error: {e}")
     
+    def _refine_topic(self, user_input: str, memory_path: str):
+        """
+        Replace the heuristic topic of a stored interaction with an LLM summary
+        
+        :param user_input: User's message
+        :param memory_path: Path of the stored memory entry
+        """
+        try:
+            topic_generation = self.model.generate_content(
+                f"Summarize the main topic of this conversation in 3-5 words: {user_input}"
+            )
+            topic = topic_generation.text.strip()
+            
+            if topic:
+                self.memory_manager.update_memory(memory_path, topic=topic)
+        
+        except Exception as e:
+            logging.error(f"Topic refinement error: {e}")
+    
     def interactive_chat(self):
         """
         Run an interactive chat session
@@ -187,12 +706,21 @@ class GeminiChatbot:
                     break
                 
                 if user_input:
-                    response = self.generate_response(user_input)
-                    print(f"Chatbot: {response}\n")
+                    sys.stdout.write("Chatbot: ")
+                    for piece in self.stream_response(user_input):
+                        sys.stdout.write(piece)
+                        sys.stdout.flush()
+                    print("\n")
             
             except KeyboardInterrupt:
                 print("\nChat ended. Goodbye! 👋")
                 break
+        
+        # Let pending topic refinements and memory writes finish, then release
+        # the server-side context cache instead of waiting for its TTL
+        self._background.shutdown(wait=True)
+        self.memory_manager.flush()
+        self._drop_cache()
 
 def main():
     # Create chatbot with a specific persona
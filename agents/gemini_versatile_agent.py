@@ -5,8 +5,16 @@ import json
 import logging
 from typing import Dict, Any, Optional
 
-import google.generativeai as genai
-from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Running as a script puts agents/ instead of the project root on sys.path;
+# package imports (python -m ...) resolve through the normal finders
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents._gemini_bootstrap import configure_gemini, get_model
 
 class VersatileGeminiAgent:
     """
@@ -27,28 +35,16 @@ class VersatileGeminiAgent:
         )
         self.logger = logging.getLogger(__name__)
         
-        # Load environment variables
-        load_dotenv(os.path.expanduser('~/.letta/env'))
-        
-        # Configure Gemini API
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            self.logger.error("Gemini API key not found in environment")
-            raise ValueError("GEMINI_API_KEY must be set")
-        
-        genai.configure(api_key=api_key)
+        # Load environment variables and configure Gemini API (once per process)
+        configure_gemini()
         
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Initialize model
-        self.model = genai.GenerativeModel(
-            self.config.get('model', 'gemini-2.0-flash'),
-            generation_config=genai.types.GenerationConfig(
-                temperature=self.config.get('temperature', 0.7),
-                max_output_tokens=self.config.get('max_tokens', 1024)
-            )
-        )
+        # Initialize model (shared between agents with the same settings). The
+        # system prompt is a system instruction so it forms a stable, cacheable
+        # prefix instead of a message in the chat history
+        self.model = self._model_for(self.config.get('system_prompt'))
         
         # Chat session (optional)
         self.chat_session = None
@@ -81,18 +77,34 @@ class VersatileGeminiAgent:
         
         return default_config
     
+    def _model_for(self, system_prompt: Optional[str]):
+        """
+        Get the configured model with the given system instruction.
+        
+        :param system_prompt: System instruction for the model
+        :return: GenerativeModel instance
+        """
+        return get_model(
+            self.config.get('model', 'gemini-2.0-flash'),
+            system_instruction=system_prompt,
+            temperature=self.config.get('temperature', 0.7),
+            max_tokens=self.config.get('max_tokens', 1024)
+        )
+    
     def start_chat_session(self, system_prompt: Optional[str] = None):
         """
         Start a new chat session with optional system prompt.
         
+        The system prompt is applied as the model's system instruction rather
+        than sent as a first message, saving a round-trip per session.
+        
         :param system_prompt: Custom system prompt for the chat
         """
-        prompt = system_prompt or self.config.get('system_prompt')
-        self.chat_session = self.model.start_chat(history=[])
+        model = self.model
+        if system_prompt and system_prompt != self.config.get('system_prompt'):
+            model = self._model_for(system_prompt)
         
-        # Initial system message
-        if prompt:
-            self.chat_session.send_message(prompt)
+        self.chat_session = model.start_chat(history=[])
     
     def generate_response(self, prompt: str, context: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -153,15 +165,23 @@ class VersatileGeminiAgent:
                 'error': str(e)
             }
     
-    def export_config(self, output_path: str):
+    def export_config(self, output_path: str, pretty: bool = False):
         """
         Export current agent configuration to a JSON file.
         
         :param output_path: Path to save the configuration
+        :param pretty: Indent the output for human readers
         """
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            if pretty:
+                with open(output_path, 'w') as f:
+                    json.dump(self.config, f, indent=4)
+            elif orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(self.config))
+            else:
+                with open(output_path, 'w') as f:
+                    f.write(json.dumps(self.config, separators=(',', ':')))
             self.logger.info(f"Configuration exported to {output_path}")
         except Exception as e:
             self.logger.error(f"Configuration export failed: {e}")
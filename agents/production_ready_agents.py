@@ -8,12 +8,14 @@ These agents are optimized for different use cases and demonstrate best practice
 
 import os
 import sys
-import argparse
+import asyncio
 import logging
 from dotenv import load_dotenv
 
-# Add project root to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Running as a script puts agents/ instead of the project root on sys.path;
+# package imports (python -m ...) resolve through the normal finders
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.create_letta_gemini_agent import LettaAgentCreator
 from scripts.gemini_integration import create_letta_agent_config
 
@@ -62,6 +64,23 @@ def create_single_agent(name: str, description: str, system_prompt: str, usernam
             "error": result.get("error", "Unknown error")
         }
 
+async def _create_agents_concurrently(creator: LettaAgentCreator, agents: list) -> list:
+    """Issue all agent creation requests at once; they share no state besides the session"""
+    
+    for agent_config in agents:
+        logger.info(f"Creating agent: {agent_config['name']}")
+    
+    tasks = [
+        asyncio.to_thread(
+            creator.create_gemini_chat_agent,
+            name=agent_config["name"],
+            description=agent_config["description"],
+            system_prompt=agent_config["system_prompt"]
+        )
+        for agent_config in agents
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
 def create_production_agents(username=None, password=None, letta_url="http://localhost:8283"):
     """Create a set of production-ready agents in Letta"""
     
@@ -128,14 +147,12 @@ Focus on being helpful and supportive of the user's creative process."""
     agents = [general_assistant, code_expert, creative_writer]
     results = []
     
-    for agent_config in agents:
-        logger.info(f"Creating agent: {agent_config['name']}")
-        
-        result = creator.create_gemini_chat_agent(
-            name=agent_config["name"],
-            description=agent_config["description"],
-            system_prompt=agent_config["system_prompt"]
-        )
+    # Create all agents concurrently; total time is the slowest request, not the sum
+    creation_results = asyncio.run(_create_agents_concurrently(creator, agents))
+    
+    for agent_config, result in zip(agents, creation_results):
+        if isinstance(result, Exception):
+            result = {"success": False, "error": str(result)}
         
         if result["success"]:
             logger.info(f"✅ Successfully created: {agent_config['name']}")
@@ -169,9 +186,36 @@ Focus on being helpful and supportive of the user's creative process."""
     
     return success_count > 0
 
+# Flags accepted by the argparse-free fast path (all create the default agent set)
+_COMMON_FLAGS = {"--letta-url": "letta_url", "--username": "username", "--password": "password"}
+
+def _parse_common_args(argv):
+    """Parse the common invocations without argparse; returns None for anything else"""
+    
+    options = {}
+    args = iter(argv)
+    for arg in args:
+        flag, sep, value = arg.partition("=")
+        if flag not in _COMMON_FLAGS:
+            return None
+        if not sep:
+            value = next(args, None)
+            if value is None:
+                return None
+        options[_COMMON_FLAGS[flag]] = value
+    return options
+
 def main():
     """Parse command line arguments and create agents"""
     
+    # Common case: no arguments or only connection flags, so skip building the parser
+    options = _parse_common_args(sys.argv[1:])
+    if options is not None:
+        success = create_production_agents(**options)
+        sys.exit(0 if success else 1)
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Create production-ready Gemini agents in Letta")
     
     parser.add_argument("--letta-url", default="http://localhost:8283",
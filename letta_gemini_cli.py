@@ -8,13 +8,11 @@ import os
 import sys
 import argparse
 import json
+import signal
+import asyncio
 import logging
-import subprocess
-import webbrowser
-import time
-import tempfile
-from typing import Dict, Any, List, Optional
-from dotenv import load_dotenv
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -23,60 +21,120 @@ logging.basicConfig(
 )
 logger = logging.getLogger("letta_gemini_cli")
 
-# Add project root to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from scripts.gemini_integration import GeminiAPI, create_letta_agent_config
-from scripts.create_letta_gemini_agent import LettaAgentCreator
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 
-# Load environment variables
-env_path = os.path.expanduser("~/.letta/env")
-if os.path.exists(env_path):
-    load_dotenv(env_path)
+# Platform command for opening documents and URLs in the default application
+SYSTEM_OPENER = 'open' if sys.platform == 'darwin' else 'xdg-open'
+
+def _spawn_opener(target: str) -> bool:
+    """Hand a file or URL to the platform opener without waiting for it"""
+    # posix_spawn skips subprocess' fork-and-setup path; SIGPIPE is ignored by
+    # Python and that would otherwise leak into the child
+    if not hasattr(os, 'posix_spawnp'):
+        return False
+    try:
+        os.posix_spawnp(SYSTEM_OPENER, [SYSTEM_OPENER, target], os.environ,
+                        setsigdef=(signal.SIGPIPE,))
+    except OSError:
+        return False
+    return True
+
+# Add project root to path for imports; the project modules themselves pull in
+# the Gemini SDK and requests, so they are imported where first needed
+sys.path.append(PROJECT_ROOT)
+if TYPE_CHECKING:
+    import requests
+    from scripts.gemini_integration import GeminiAPI
+    from scripts.create_letta_gemini_agent import LettaAgentCreator
+
+def load_environment() -> None:
+    """Load environment variables from ~/.letta/env without overriding set ones"""
+    # The API key is the only setting the CLI itself reads from the file
+    if os.getenv("GEMINI_API_KEY") is not None:
+        return
+    
+    env_path = os.path.expanduser("~/.letta/env")
+    try:
+        with open(env_path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        logger.warning(f"Environment file not found at {env_path}")
+        return
+    
+    # Plain KEY=value lines, as written by configure_letta_env.py
+    for line in data.decode('utf-8').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        key = key.strip()
+        if key.startswith('export '):
+            key = key[len('export '):].strip()
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        os.environ.setdefault(key, value)
     logger.info(f"Loaded environment variables from {env_path}")
-else:
-    logger.warning(f"Environment file not found at {env_path}")
 
 class LettaGeminiCLI:
     """Main CLI class for managing Letta-Gemini integration"""
     
+    STATUS_TIMEOUT = 2
+    
     def __init__(self, letta_url: str = "http://localhost:8283"):
         """Initialize the CLI with Letta server URL"""
         self.letta_url = letta_url
-        self.scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
-        self.docs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs")
+        load_environment()
+    
+    @cached_property
+    def scripts_dir(self) -> str:
+        """Directory holding the helper scripts"""
+        return os.path.join(PROJECT_ROOT, "scripts")
+    
+    @cached_property
+    def docs_dir(self) -> str:
+        """Directory holding the documentation"""
+        return os.path.join(PROJECT_ROOT, "docs")
+    
+    @cached_property
+    def http(self) -> "requests.Session":
+        """Keep-alive session shared by status checks and the agent creator"""
+        import requests
+        from requests.adapters import HTTPAdapter
         
-        # Initialize components as needed
-        self._creator = None
-        self._gemini = None
-    
-    @property
-    def creator(self) -> LettaAgentCreator:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    @cached_property
+    def creator(self) -> "LettaAgentCreator":
         """Lazy-loaded LettaAgentCreator"""
-        if not self._creator:
-            try:
-                self._creator = LettaAgentCreator(letta_url=self.letta_url)
-            except Exception as e:
-                logger.error(f"Failed to initialize agent creator: {e}")
-                raise
-        return self._creator
-    
-    @property
-    def gemini(self) -> GeminiAPI:
+        from scripts.create_letta_gemini_agent import LettaAgentCreator
+        try:
+            return LettaAgentCreator(letta_url=self.letta_url, session=self.http)
+        except Exception as e:
+            logger.error(f"Failed to initialize agent creator: {e}")
+            raise
+    
+    @cached_property
+    def gemini(self) -> "GeminiAPI":
         """Lazy-loaded GeminiAPI"""
-        if not self._gemini:
-            try:
-                self._gemini = GeminiAPI()
-                logger.info(f"Successfully initialized Gemini API with model: {self._gemini.model}")
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini API: {e}")
-                raise
-        return self._gemini
+        from scripts.gemini_integration import GeminiAPI
+        try:
+            gemini = GeminiAPI()
+        except Exception as e:
+            logger.error(f"Failed to initialize Gemini API: {e}")
+            raise
+        logger.info(f"Successfully initialized Gemini API with model: {gemini.model}")
+        return gemini
     
     def check_letta_status(self) -> bool:
         """Check if Letta server is running"""
         try:
-            import requests
-            response = requests.get(self.letta_url)
+            # Short timeout so a hung server cannot stall the CLI
+            response = self.http.get(self.letta_url, timeout=self.STATUS_TIMEOUT)
             return response.status_code == 200
         except Exception:
             return False
@@ -91,27 +149,16 @@ class LettaGeminiCLI:
     
     def run_uat_tests(self) -> bool:
         """Run the user acceptance tests for Gemini integration"""
-        uat_script = os.path.join(self.scripts_dir, "run_gemini_integration_uat.py")
-        
-        if not os.path.exists(uat_script):
-            logger.error(f"UAT script not found at: {uat_script}")
+        # Run in-process: the UAT suite needs the same modules this CLI has
+        # already imported, so starting a second interpreter only adds latency
+        try:
+            from scripts.run_gemini_integration_uat import run_uat
+        except (ImportError, SystemExit) as e:
+            logger.error(f"Failed to load UAT tests: {e}")
             return False
         
         try:
-            result = subprocess.run(
-                [sys.executable, uat_script],
-                capture_output=True,
-                text=True
-            )
-            
-            # Print the output
-            print(result.stdout)
-            
-            if result.stderr:
-                print("Errors:")
-                print(result.stderr)
-            
-            return result.returncode == 0
+            return run_uat(letta_url=self.letta_url)
         except Exception as e:
             logger.error(f"Failed to run UAT tests: {e}")
             return False
@@ -139,6 +186,7 @@ class LettaGeminiCLI:
     
     def generate_agent_config_file(self, name: str, description: str, system_prompt: str, output_path: Optional[str] = None) -> str:
         """Generate an agent configuration file for manual import"""
+        from scripts.gemini_integration import create_letta_agent_config
         
         # Create the agent configuration
         agent_config = create_letta_agent_config(
@@ -152,6 +200,7 @@ class LettaGeminiCLI:
         
         # If no output path specified, create a temporary file
         if not output_path:
+            import tempfile
             fd, output_path = tempfile.mkstemp(suffix=".json", prefix=f"letta_agent_{name}_")
             os.close(fd)
         
@@ -164,7 +213,9 @@ class LettaGeminiCLI:
     
     def open_letta_ade(self) -> None:
         """Open the Letta ADE in a web browser"""
-        webbrowser.open(self.letta_url)
+        if not _spawn_opener(self.letta_url):
+            import webbrowser
+            webbrowser.open(self.letta_url)
         logger.info(f"Opened Letta ADE in web browser: {self.letta_url}")
     
     def open_docs(self, doc_name: str) -> None:
@@ -178,9 +229,10 @@ class LettaGeminiCLI:
             logger.error(f"Documentation not found: {doc_path}")
             return
         
-        # On macOS, use 'open' command
         try:
-            subprocess.run(['open', doc_path])
+            if not _spawn_opener(doc_path):
+                import webbrowser
+                webbrowser.open(f"file://{doc_path}")
             logger.info(f"Opened documentation: {doc_path}")
         except Exception as e:
             logger.error(f"Failed to open documentation: {e}")
@@ -199,46 +251,31 @@ class LettaGeminiCLI:
     
     def start_dashboard(self, port: int = 8099) -> None:
         """Start the Letta Admin Dashboard"""
-        dashboard_script = os.path.join(self.scripts_dir, "letta_admin_dashboard.py")
-        
-        if not os.path.exists(dashboard_script):
-            logger.error(f"Dashboard script not found at: {dashboard_script}")
+        try:
+            from scripts.letta_dashboard import run_dashboard
+        except ImportError as e:
+            logger.error(f"Failed to load dashboard: {e}")
             return
         
+        # Serves from a thread in this process and opens the browser itself;
+        # returns once the dashboard is stopped with Ctrl+C
         try:
-            # Start the dashboard in the background
-            process = subprocess.Popen(
-                [sys.executable, dashboard_script, "--port", str(port)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Give the server time to start
-            time.sleep(2)
-            
-            # Open in browser
-            dashboard_url = f"http://localhost:{port}"
-            webbrowser.open(dashboard_url)
-            
-            logger.info(f"Dashboard started at {dashboard_url}")
-            logger.info("Press Ctrl+C to stop the dashboard")
-            
-            # Keep the dashboard running
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                process.terminate()
-                logger.info("Dashboard stopped")
+            run_dashboard(letta_url=self.letta_url, port=port)
         except Exception as e:
             logger.error(f"Failed to start dashboard: {e}")
 
+async def _probe_status(cli: LettaGeminiCLI) -> tuple:
+    """Run the independent status checks at once; total time is the slowest check"""
+    return await asyncio.gather(
+        asyncio.to_thread(cli.check_letta_status),
+        asyncio.to_thread(cli.check_gemini_status),
+        asyncio.to_thread(cli.list_agents)
+    )
+
 
 def handle_status_command(cli: LettaGeminiCLI):
     """Handle the 'status' command"""
-    letta_status = cli.check_letta_status()
-    gemini_status = cli.check_gemini_status()
+    letta_status, gemini_status, result = asyncio.run(_probe_status(cli))
     
     print("\n=== Letta-Gemini Integration Status ===")
     print(f"Letta Server: {'✅ Online' if letta_status else '❌ Offline'}")
@@ -247,7 +284,6 @@ def handle_status_command(cli: LettaGeminiCLI):
     print(f"Gemini API Key: {'✅ Configured' if os.getenv('GEMINI_API_KEY') else '❌ Not Found'}")
     
     # List agents
-    result = cli.list_agents()
     agents = result.get("agents", []) if result.get("success") else []
     
     print(f"\nFound {len(agents)} agent(s) on the Letta server:")
@@ -395,7 +431,7 @@ def handle_docs_command(cli: LettaGeminiCLI, doc_name: Optional[str]):
         return
     
     # List available docs
-    docs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs")
+    docs_dir = cli.docs_dir
     
     if not os.path.exists(docs_dir):
         print("❌ Documentation directory not found.")
@@ -485,6 +521,7 @@ Always provide the most relevant information to the user's query."""
         print("---------------")
         
         # Save to a temporary file for easy copying
+        import tempfile
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
             f.write(system_prompt)
             prompt_file = f.name
@@ -544,39 +581,55 @@ def main():
     
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
+    # Each subparser carries its handler, so dispatch is a single attribute lookup
+    
     # Status command
     status_parser = subparsers.add_parser("status", help="Check integration status")
+    status_parser.set_defaults(func=lambda cli, args: handle_status_command(cli))
     
     # Dashboard command
     dashboard_parser = subparsers.add_parser("dashboard", help="Start the admin dashboard")
     dashboard_parser.add_argument("--port", type=int, help="Port to run the dashboard on")
+    dashboard_parser.set_defaults(func=lambda cli, args: handle_dashboard_command(cli, args.port))
     
     # UAT command
     uat_parser = subparsers.add_parser("uat", help="Run user acceptance tests")
+    uat_parser.set_defaults(func=lambda cli, args: handle_uat_command(cli))
     
     # Create agent command
     create_parser = subparsers.add_parser("create-agent", help="Create a new agent")
     create_parser.add_argument("--name", help="Agent name")
     create_parser.add_argument("--description", help="Agent description")
     create_parser.add_argument("--system-prompt", help="System prompt/instructions")
+    create_parser.set_defaults(func=handle_create_agent_command)
     
     # List agents command
     list_parser = subparsers.add_parser("list-agents", help="List all agents")
+    list_parser.set_defaults(func=lambda cli, args: handle_list_agents_command(cli))
     
     # Docs command
     docs_parser = subparsers.add_parser("docs", help="View documentation")
     docs_parser.add_argument("doc_name", nargs="?", help="Name of documentation to view")
+    docs_parser.set_defaults(func=lambda cli, args: handle_docs_command(cli, args.doc_name))
     
     # Test Gemini command
     test_gemini_parser = subparsers.add_parser("test-gemini", help="Test the Gemini API")
     test_gemini_parser.add_argument("prompt", nargs="?", help="Test prompt")
+    test_gemini_parser.set_defaults(func=lambda cli, args: handle_test_gemini_command(cli, args.prompt))
     
     # Web workflow command
     web_workflow_parser = subparsers.add_parser("web-workflow", 
                                             help="Interactive web-based workflow for agent creation")
+    web_workflow_parser.set_defaults(func=lambda cli, args: handle_web_workflow_command(cli))
     
     args = parser.parse_args()
     
+    # Default to showing help, without setting up the CLI
+    handler = getattr(args, "func", None)
+    if handler is None:
+        parser.print_help()
+        return 0
+    
     # Create CLI instance
     try:
         cli = LettaGeminiCLI(letta_url=args.letta_url)
@@ -586,25 +639,7 @@ def main():
     
     # Handle commands
     try:
-        if args.command == "status":
-            handle_status_command(cli)
-        elif args.command == "dashboard":
-            handle_dashboard_command(cli, args.port)
-        elif args.command == "uat":
-            handle_uat_command(cli)
-        elif args.command == "create-agent":
-            handle_create_agent_command(cli, args)
-        elif args.command == "list-agents":
-            handle_list_agents_command(cli)
-        elif args.command == "docs":
-            handle_docs_command(cli, args.doc_name)
-        elif args.command == "test-gemini":
-            handle_test_gemini_command(cli, args.prompt)
-        elif args.command == "web-workflow":
-            handle_web_workflow_command(cli)
-        else:
-            # Default to showing help
-            parser.print_help()
+        handler(cli, args)
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
     except Exception as e:
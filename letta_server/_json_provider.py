@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared orjson-backed Flask JSON provider.
+
+Both the memory server (letta_server/app.py) and the agent server
+(letta_server_manager.py) install it when orjson is available, so request
+parsing and jsonify behave the same in either app.
+"""
+
+from typing import Any
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, used for request parsing and jsonify
+
+    Only install it when orjson is not None.
+    """
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 import os
+import re
+import sys
 import json
+import time
 import uuid
+import sqlite3
 import logging
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+# Running as a script puts letta_server/ instead of the project root on sys.path;
+# package imports (python -m ...) resolve through the normal finders
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from letta_server._json_provider import OrjsonProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,18 +35,318 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in memory filenames. In str patterns \w matches exactly
+# the str.isalnum() characters plus underscore, so Unicode letters are kept.
+_UNSAFE_TOPIC_CHARS = re.compile(r'[^\w ]')
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to JSON bytes, using orjson when it is installed
+    
+    :param obj: JSON-compatible object
+    :param indent: Pretty-print with two-space indentation
+    :return: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Memory files are opened relative to a long-lived directory descriptor where the
+# platform allows it, so each access resolves one path component instead of the
+# whole path to the memory directory
+_DIR_FD_SUPPORTED = (
+    os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+
+@functools.lru_cache(maxsize=1024)
+def _load_memory_file(dir_fd: Optional[int], path: str, mtime_ns: int, size: int) -> Tuple[bytes, Any]:
+    """
+    Read and parse a memory file; mtime and size only key the cache so
+    rewritten files are never served stale. Results are shared, so treat
+    them as read-only.
+    
+    :param dir_fd: Directory descriptor path is relative to, or None
+    :param path: Memory file path
+    :param mtime_ns: File modification time
+    :param size: File size in bytes
+    :return: Tuple of the raw UTF-8 JSON text and the parsed memory entry
+    """
+    with open(os.open(path, os.O_RDONLY, dir_fd=dir_fd), 'rb') as f:
+        raw = f.read()
+    # Decoding first guarantees the raw text can be spliced into UTF-8 responses
+    return raw, _loads(raw.decode('utf-8'))
+
+def _read_memory_file(dir_fd: Optional[int], path: str) -> Tuple[bytes, Any]:
+    """
+    Load a memory file, serving unchanged files from memory
+    
+    :param dir_fd: Directory descriptor path is relative to, or None
+    :param path: Memory file path
+    :return: Tuple of the raw JSON text and the parsed memory entry
+    """
+    st = os.stat(path, dir_fd=dir_fd)
+    return _load_memory_file(dir_fd, path, st.st_mtime_ns, st.st_size)
+
 class LettaMemoryManager:
     """
     Manages memory storage and retrieval for Letta server
     """
-    def __init__(self, memory_dir: str = None):
+    # Sidecar index of memory metadata; it only holds derived data, so it is
+    # rebuilt from the memory files whenever the schema changes
+    INDEX_FILENAME = 'meta.db'
+    INDEX_SCHEMA_VERSION = 2
+    # Directory mtimes this recent are not trusted, since a write landing in the
+    # same timestamp tick as a sync would otherwise go unnoticed
+    MTIME_SETTLE_NS = 2 * 10**9
+    IO_WORKERS = 16
+    
+    def __init__(self, memory_dir: str = None, durable: Optional[bool] = None):
         """
         Initialize memory storage
         
         :param memory_dir: Custom memory storage directory
+        :param durable: Flush each stored memory to disk before acknowledging it;
+                        defaults to the LETTA_DURABLE_WRITES environment variable
         """
         self.memory_dir = memory_dir or os.path.expanduser('~/.letta/memories')
+        if durable is None:
+            durable = os.getenv('LETTA_DURABLE_WRITES', '').lower() in ('1', 'true', 'yes')
+        self.durable = durable
         os.makedirs(self.memory_dir, exist_ok=True)
+        self._dir_fd = os.open(self.memory_dir, os.O_RDONLY) if _DIR_FD_SUPPORTED else None
+        
+        # Flask serves requests from several threads; the lock serializes index access
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.memory_dir, self.INDEX_FILENAME),
+            check_same_thread=False
+        )
+        # Persistent pool for overlapping file reads (the GIL is released during I/O)
+        self._io_pool = ThreadPoolExecutor(max_workers=self.IO_WORKERS)
+        # Directory mtime at the last sync; None forces a rescan
+        self._synced_mtime_ns = None
+        self._init_index()
+        self._sync_index()
+    
+    def _init_index(self) -> None:
+        """
+        Create the index tables, dropping any index left by an older schema
+        """
+        version = self._db.execute('PRAGMA user_version').fetchone()[0]
+        if version == self.INDEX_SCHEMA_VERSION:
+            return
+        
+        with self._db:
+            # Several server processes may start together; the write lock makes
+            # one of them build the index and the others see it done
+            self._db.execute('BEGIN IMMEDIATE')
+            if self._db.execute('PRAGMA user_version').fetchone()[0] == self.INDEX_SCHEMA_VERSION:
+                return
+            
+            self._db.execute('DROP TABLE IF EXISTS memory_tags')
+            self._db.execute('DROP TABLE IF EXISTS memories')
+            # topic is stored lowercased for case-insensitive substring search
+            self._db.execute(
+                'CREATE TABLE memories ('
+                'filename TEXT PRIMARY KEY, id TEXT, topic TEXT NOT NULL, '
+                'timestamp TEXT NOT NULL, mtime_ns INTEGER NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX idx_memories_id ON memories (id)')
+            self._db.execute('CREATE INDEX idx_memories_timestamp ON memories (timestamp)')
+            self._db.execute(
+                'CREATE TABLE memory_tags ('
+                'tag TEXT NOT NULL, filename TEXT NOT NULL, PRIMARY KEY (tag, filename))'
+            )
+            self._db.execute(f'PRAGMA user_version = {self.INDEX_SCHEMA_VERSION}')
+        logger.info(f"Created memory index in {self.memory_dir}")
+    
+    def _path(self, filename: str) -> str:
+        """
+        Path of a memory file, relative to the directory descriptor when one is held
+        
+        :param filename: Memory file name inside the memory directory
+        :return: Path to pass along with dir_fd=self._dir_fd
+        """
+        return filename if self._dir_fd is not None else os.path.join(self.memory_dir, filename)
+    
+    def _opener(self, path: str, flags: int) -> int:
+        """
+        open() opener resolving paths against the memory directory descriptor
+        """
+        return os.open(path, flags, 0o666, dir_fd=self._dir_fd)
+    
+    def _index_file(self, filename: str, memory: Dict[str, Any], mtime_ns: int) -> None:
+        """
+        Record a memory file's metadata; the caller holds the lock and transaction
+        
+        :param filename: Memory file name inside the memory directory
+        :param memory: Parsed memory entry
+        :param mtime_ns: File modification time the metadata was read at
+        """
+        memory_id = memory.get('id')
+        self._db.execute(
+            'INSERT OR REPLACE INTO memories (filename, id, topic, timestamp, mtime_ns) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (
+                filename,
+                memory_id if isinstance(memory_id, str) else None,
+                str(memory.get('topic', '')).lower(),
+                str(memory.get('timestamp', '')),
+                mtime_ns
+            )
+        )
+        self._db.execute('DELETE FROM memory_tags WHERE filename = ?', (filename,))
+        tags = memory.get('tags')
+        if isinstance(tags, list):
+            self._db.executemany(
+                'INSERT OR IGNORE INTO memory_tags (tag, filename) VALUES (?, ?)',
+                [(tag, filename) for tag in tags if isinstance(tag, str)]
+            )
+    
+    def _unindex_file(self, filename: str) -> None:
+        """
+        Drop a memory file from the index; the caller holds the lock and transaction
+        
+        :param filename: Memory file name inside the memory directory
+        """
+        self._db.execute('DELETE FROM memories WHERE filename = ?', (filename,))
+        self._db.execute('DELETE FROM memory_tags WHERE filename = ?', (filename,))
+    
+    def _read_for_index(self, filename: str) -> Tuple[Any, Optional[Exception]]:
+        """
+        Parse a memory file for indexing; runs on the I/O pool
+        
+        :param filename: Memory file name inside the memory directory
+        :return: Tuple of the parsed entry and the error that prevented reading it
+        """
+        try:
+            with open(self._path(filename), 'rb', opener=self._opener) as f:
+                return _loads(f.read()), None
+        except (OSError, ValueError) as e:
+            return None, e
+    
+    def _sync_index(self) -> None:
+        """
+        Bring the index up to date with memory files added, replaced or removed
+        by other tools sharing the directory. Only runs when the directory
+        itself has changed; files rewritten in place are not picked up.
+        """
+        dir_mtime_ns = os.stat(
+            self._dir_fd if self._dir_fd is not None else self.memory_dir
+        ).st_mtime_ns
+        if dir_mtime_ns == self._synced_mtime_ns:
+            return
+        
+        complete = True
+        with self._lock, self._db:
+            indexed = dict(self._db.execute('SELECT filename, mtime_ns FROM memories'))
+            
+            changed = []
+            for entry in os.scandir(self._dir_fd if self._dir_fd is not None else self.memory_dir):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    mtime_ns = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                if indexed.pop(entry.name, None) != mtime_ns:
+                    changed.append((entry.name, mtime_ns))
+            
+            # Read changed files concurrently; a cold start can touch every file
+            loaded = self._io_pool.map(self._read_for_index, [name for name, _ in changed])
+            for (filename, mtime_ns), (memory, error) in zip(changed, loaded):
+                if isinstance(error, FileNotFoundError):
+                    self._unindex_file(filename)
+                elif error is not None:
+                    # Possibly still being written; retry on the next sync
+                    logger.warning(f"Skipping unreadable memory file {filename}: {error}")
+                    complete = False
+                elif isinstance(memory, dict):
+                    self._index_file(filename, memory, mtime_ns)
+            
+            # Whatever is left was deleted from disk
+            for filename in indexed:
+                self._unindex_file(filename)
+        
+        settled = time.time_ns() - dir_mtime_ns > self.MTIME_SETTLE_NS
+        self._synced_mtime_ns = dir_mtime_ns if complete and settled else None
+    
+    def _lookup_memory_file(self, memory_id: str) -> Optional[str]:
+        """
+        Find the file holding a memory in the index
+        
+        :param memory_id: Unique memory identifier
+        :return: Matching file name, or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT filename FROM memories WHERE id = ?', (memory_id,)
+            ).fetchone()
+            if row is None:
+                # Entries written without an ID field are addressed by file name
+                row = self._db.execute(
+                    'SELECT filename FROM memories WHERE instr(filename, ?) > 0', (memory_id,)
+                ).fetchone()
+        return row[0] if row else None
+    
+    def _write_memory(self, 
+                      content: Dict[str, Any], 
+                      topic: Optional[str] = None,
+                      tags: Optional[List[str]] = None) -> Tuple[str, Dict[str, Any], str]:
+        """
+        Write a new memory file without indexing it
+        
+        :param content: Memory content
+        :param topic: Optional topic for the memory
+        :param tags: Optional tags for the memory
+        :return: Tuple of memory ID, memory entry and file name
+        """
+        # Generate unique memory ID
+        memory_id = str(uuid.uuid4())
+        
+        # Prepare memory entry
+        memory_entry = {
+            'id': memory_id,
+            'entry_type': 'user_memory',
+            'topic': topic or 'Untitled Memory',
+            'timestamp': datetime.now().isoformat(),
+            'content': content,
+            'tags': tags or []
+        }
+        
+        # Generate filename
+        safe_topic = _UNSAFE_TOPIC_CHARS.sub('_', memory_entry['topic']).lower()
+        filename = f"{safe_topic}_{memory_id}.json"
+        
+        # Write to file; stored compact, pretty-printing is left to readers
+        with open(self._path(filename), 'wb', opener=self._opener) as f:
+            f.write(_dumps(memory_entry))
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        
+        return memory_id, memory_entry, filename
+    
+    def _index_written(self, written: List[Tuple[str, Dict[str, Any], str]]) -> None:
+        """
+        Index freshly written memory files in a single transaction
+        
+        :param written: Tuples returned by _write_memory
+        """
+        if self.durable and self._dir_fd is not None:
+            # One directory flush makes the whole batch's new entries durable
+            os.fsync(self._dir_fd)
+        
+        with self._lock, self._db:
+            for _, memory_entry, filename in written:
+                mtime_ns = os.stat(self._path(filename), dir_fd=self._dir_fd).st_mtime_ns
+                self._index_file(filename, memory_entry, mtime_ns)
     
     def store_memory(self, 
                      content: Dict[str, Any], 
@@ -43,28 +361,10 @@ class LettaMemoryManager:
         :return: Unique memory ID
         """
         try:
-            # Generate unique memory ID
-            memory_id = str(uuid.uuid4())
-            
-            # Prepare memory entry
-            memory_entry = {
-                'id': memory_id,
-                'entry_type': 'user_memory',
-                'topic': topic or 'Untitled Memory',
-                'timestamp': datetime.now().isoformat(),
-                'content': content,
-                'tags': tags or []
-            }
-            
-            # Generate filename
-            safe_topic = ''.join(c if c.isalnum() or c in [' ', '_'] else '_' for c in memory_entry['topic']).lower()
-            filename = f"{safe_topic}_{memory_id}.json"
-            filepath = os.path.join(self.memory_dir, filename)
-            
-            # Write to file
-            with open(filepath, 'w') as f:
-                json.dump(memory_entry, f, indent=4)
+            written = self._write_memory(content, topic, tags)
+            self._index_written([written])
             
+            memory_id = written[0]
             logger.info(f"Memory stored: {memory_id}")
             return memory_id
         
@@ -72,6 +372,32 @@ class LettaMemoryManager:
             logger.error(f"Memory storage error: {e}")
             raise
     
+    def store_memories(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several memory entries, indexing them in one transaction
+        
+        :param entries: Dicts with 'content' and optional 'topic' and 'tags'
+        :return: Unique memory IDs, in input order
+        """
+        written = []
+        try:
+            for entry in entries:
+                written.append(self._write_memory(
+                    entry['content'], entry.get('topic'), entry.get('tags')
+                ))
+            
+            logger.info(f"Stored {len(written)} memories")
+            return [memory_id for memory_id, _, _ in written]
+        
+        except Exception as e:
+            logger.error(f"Bulk memory storage error: {e}")
+            raise
+        
+        finally:
+            # Files already on disk are indexed even if a later entry failed
+            if written:
+                self._index_written(written)
+    
     def retrieve_memory(self, memory_id: str) -> Dict[str, Any]:
         """
         Retrieve a specific memory by ID
@@ -80,19 +406,74 @@ class LettaMemoryManager:
         :return: Memory content
         """
         try:
-            # Search for file with matching memory ID
-            for filename in os.listdir(self.memory_dir):
-                if memory_id in filename:
-                    filepath = os.path.join(self.memory_dir, filename)
-                    with open(filepath, 'r') as f:
-                        return json.load(f)
+            filename = self._lookup_memory_file(memory_id)
+            if filename is None:
+                # May have been written by another tool since the last sync
+                self._sync_index()
+                filename = self._lookup_memory_file(memory_id)
+            if filename is None:
+                raise FileNotFoundError(f"Memory {memory_id} not found")
             
-            raise FileNotFoundError(f"Memory {memory_id} not found")
+            return _read_memory_file(self._dir_fd, self._path(filename))[1]
         
         except Exception as e:
             logger.error(f"Memory retrieval error: {e}")
             raise
     
+    def _read_listed_file(self, filename: str) -> Optional[Tuple[bytes, Any]]:
+        """
+        Load a listed memory file; runs on the I/O pool
+        
+        :param filename: Memory file name inside the memory directory
+        :return: Tuple of raw JSON text and parsed entry, or None if it was removed
+        """
+        try:
+            return _read_memory_file(self._dir_fd, self._path(filename))
+        except FileNotFoundError:
+            # Removed since the last sync
+            return None
+    
+    def _read_listed(self, 
+                     tag: Optional[str] = None, 
+                     topic: Optional[str] = None) -> List[Tuple[bytes, Any]]:
+        """
+        Load the memories matching a listing filter, most recent first
+        
+        :param tag: Optional tag to filter memories
+        :param topic: Optional topic to filter memories
+        :return: Tuples of raw JSON text and parsed memory entry
+        """
+        self._sync_index()
+        
+        # Filter and sort in the index so only matching files are read
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT filename FROM memories m '
+                'WHERE (:tag IS NULL OR EXISTS ('
+                'SELECT 1 FROM memory_tags t WHERE t.tag = :tag AND t.filename = m.filename)) '
+                'AND (:topic IS NULL OR instr(m.topic, :topic) > 0) '
+                'ORDER BY m.timestamp DESC',
+                {'tag': tag or None, 'topic': topic.lower() if topic else None}
+            ).fetchall()
+        
+        filenames = [filename for (filename,) in rows]
+        if len(filenames) > 1:
+            # Overlap the reads that miss the file cache
+            loaded = self._io_pool.map(self._read_listed_file, filenames)
+        else:
+            loaded = map(self._read_listed_file, filenames)
+        return [item for item in loaded if item is not None]
+    
+    def count_memories(self) -> int:
+        """
+        Count stored memories from the index
+        
+        :return: Number of memory files
+        """
+        self._sync_index()
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM memories').fetchone()[0]
+    
     def list_memories(self, 
                       tag: Optional[str] = None, 
                       topic: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -103,22 +484,26 @@ class LettaMemoryManager:
         :param topic: Optional topic to filter memories
         :return: List of memory metadata
         """
-        memories = []
         try:
-            for filename in os.listdir(self.memory_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.memory_dir, filename)
-                    with open(filepath, 'r') as f:
-                        memory = json.load(f)
-                    
-                    # Apply filters
-                    if (not tag or tag in memory.get('tags', [])) and \
-                       (not topic or topic.lower() in memory.get('topic', '').lower()):
-                        memories.append(memory)
-            
-            # Sort memories by timestamp, most recent first
-            memories.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            return memories
+            return [memory for _, memory in self._read_listed(tag, topic)]
+        
+        except Exception as e:
+            logger.error(f"Memory listing error: {e}")
+            raise
+    
+    def list_memories_json(self, 
+                           tag: Optional[str] = None, 
+                           topic: Optional[str] = None) -> bytes:
+        """
+        List memories as a JSON array built from the stored file contents,
+        so entries are not re-serialized on every request
+        
+        :param tag: Optional tag to filter memories
+        :param topic: Optional topic to filter memories
+        :return: UTF-8 encoded JSON array of memories
+        """
+        try:
+            return b'[' + b','.join(raw for raw, _ in self._read_listed(tag, topic)) + b']'
         
         except Exception as e:
             logger.error(f"Memory listing error: {e}")
@@ -126,6 +511,8 @@ class LettaMemoryManager:
 
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # Initialize memory manager
@@ -159,6 +546,31 @@ def create_memory():
         logger.error(f"Memory creation error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/memories/bulk', methods=['POST'])
+def create_memories():
+    """
+    API endpoint to create several memories in one request
+    """
+    try:
+        data = request.json
+        
+        # Validate input
+        if not isinstance(data, list) or not all(
+            isinstance(entry, dict) and 'content' in entry for entry in data
+        ):
+            return jsonify({"error": "Expected a list of memories with content"}), 400
+        
+        memory_ids = memory_manager.store_memories(data)
+        
+        return jsonify({
+            "message": f"{len(memory_ids)} memories created successfully",
+            "memory_ids": memory_ids
+        }), 201
+    
+    except Exception as e:
+        logger.error(f"Bulk memory creation error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/memories', methods=['GET'])
 def list_memories():
     """
@@ -168,9 +580,12 @@ def list_memories():
         tag = request.args.get('tag')
         topic = request.args.get('topic')
         
-        memories = memory_manager.list_memories(tag=tag, topic=topic)
+        if request.args.get('pretty'):
+            memories = _dumps(memory_manager.list_memories(tag=tag, topic=topic), indent=True)
+        else:
+            memories = memory_manager.list_memories_json(tag=tag, topic=topic)
         
-        return jsonify(memories), 200
+        return app.response_class(memories, mimetype='application/json'), 200
     
     except Exception as e:
         logger.error(f"Memory listing error: {e}")
@@ -183,6 +598,8 @@ def get_memory(memory_id):
     """
     try:
         memory = memory_manager.retrieve_memory(memory_id)
+        if request.args.get('pretty'):
+            return app.response_class(_dumps(memory, indent=True), mimetype='application/json'), 200
         return jsonify(memory), 200
     
     except FileNotFoundError:
@@ -200,9 +617,46 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "version": "1.0.0",
-        "memory_count": len(os.listdir(memory_manager.memory_dir))
+        "memory_count": memory_manager.count_memories()
     }), 200
 
+def _serve_with_gunicorn(host: str, port: int) -> bool:
+    """
+    Serve the app with gunicorn worker processes, each running several threads
+    
+    :param host: Interface to bind
+    :param port: Port to bind
+    :return: False if gunicorn is not available on this platform
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+    
+    def post_fork(server, worker):
+        # SQLite connections must not cross fork(); give each worker its own
+        global memory_manager
+        memory_manager = LettaMemoryManager(memory_manager.memory_dir, memory_manager.durable)
+    
+    options = {
+        'bind': f"{host}:{port}",
+        'workers': int(os.getenv('LETTA_WORKERS', os.cpu_count() or 1)),
+        'worker_class': 'gthread',
+        'threads': int(os.getenv('LETTA_THREADS', 4)),
+        'post_fork': post_fork
+    }
+    
+    class LettaApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+    
+    LettaApplication().run()
+    return True
+
 def main():
     """
     Run the Letta server
@@ -215,7 +669,9 @@ def main():
     port = int(os.getenv('LETTA_PORT', 8283))
     
     logger.info(f"Starting Letta server on {host}:{port}")
-    app.run(host=host, port=port, debug=False)
+    if not _serve_with_gunicorn(host, port):
+        logger.warning("gunicorn is not available, using Flask's development server")
+        app.run(host=host, port=port, debug=False, threaded=True)
 
 if __name__ == '__main__':
     main()
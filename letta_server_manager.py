@@ -7,30 +7,140 @@ This script provides command-line tools for managing Letta server and Gemini age
 import os
 import sys
 import json
+import queue
+import atexit
 import argparse
+import functools
 import logging
-import subprocess
-from typing import Dict, Any, List, Optional
-from dotenv import load_dotenv
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from dotenv import dotenv_values
 import sqlite3
+import threading
+import time
 import uuid
-import jwt
-import google.generativeai as genai
 import requests
-
-# Configure logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging. Records are handed to a background thread that does the
+# file and console writes, so request handlers never wait on log I/O.
+_log_path = os.path.expanduser('~/Library/Logs/letta-server.log')
+os.makedirs(os.path.dirname(_log_path), exist_ok=True)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler(_log_path), logging.StreamHandler(sys.stdout)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+# Stopping the listener drains whatever is still queued at exit
+atexit.register(_log_listener.stop)
+
+# The queue handler only merges arguments into the message; the listener's
+# handlers apply the real format
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.expanduser('~/Library/Logs/letta-server.log')),
-        logging.StreamHandler(sys.stdout)
-    ]
+    format='%(message)s',
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+def _format_id(conversation_id: Any) -> str:
+    """Render a stored conversation id, which is 16 UUID bytes or legacy text."""
+    if isinstance(conversation_id, bytes):
+        return str(uuid.UUID(bytes=conversation_id))
+    return conversation_id
+
+def _stored_json(value: Any) -> bytes:
+    """Return stored JSON as UTF-8 bytes; rows from before schema version 1 may hold text."""
+    return value if isinstance(value, bytes) else value.encode('utf-8')
+
+# Order of the values produced for each conversation by the listing APIs
+CONVERSATION_COLUMNS = ("id", "agent_id", "platform", "timestamp", "conversation_data", "metadata")
+_CONVERSATION_KEYS = tuple(b'"' + column.encode() + b'":' for column in CONVERSATION_COLUMNS)
+
+def _encode_row(row: Tuple) -> Tuple[bytes, ...]:
+    """Encode a selected conversation row as JSON values in CONVERSATION_COLUMNS order."""
+    conversation_id, agent, source, timestamp, data, metadata = row
+    return (
+        _dumps(_format_id(conversation_id)),
+        _dumps(agent),
+        _dumps(source),
+        _dumps(timestamp),
+        _stored_json(data),
+        _stored_json(metadata) if metadata else b'null'
+    )
+
+# Statements are kept as constants so each thread's connection reuses its
+# cached prepared statement instead of re-parsing the SQL
+CREATE_CONVERSATIONS_SQL = '''
+    CREATE TABLE IF NOT EXISTS conversations (
+        id BLOB PRIMARY KEY,
+        agent_id TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        conversation_data TEXT NOT NULL,
+        metadata TEXT
+    )
+'''
+
+INSERT_CONVERSATION_SQL = '''
+    INSERT INTO conversations 
+    (id, agent_id, platform, conversation_data, metadata) 
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Every listing filters on agent_id or platform and orders newest first,
+# so each filter gets an index that already yields rows in that order
+CREATE_CONVERSATION_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_conv_agent_ts ON conversations(agent_id, timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_conv_platform_ts ON conversations(platform, timestamp DESC)",
+)
+
+# Columns are listed explicitly so rows can be unpacked by position. Each
+# filter combination has its own fixed statement, keyed by
+# (filter by agent, filter by platform), so the SQL text never varies.
+SELECT_CONVERSATIONS_SQL = (
+    "SELECT id, agent_id, platform, timestamp, conversation_data, metadata FROM conversations"
+)
+SQL_ALL = SELECT_CONVERSATIONS_SQL + " ORDER BY timestamp DESC LIMIT ?"
+SQL_BY_AGENT = SELECT_CONVERSATIONS_SQL + " WHERE agent_id = ? ORDER BY timestamp DESC LIMIT ?"
+SQL_BY_PLATFORM = SELECT_CONVERSATIONS_SQL + " WHERE platform = ? ORDER BY timestamp DESC LIMIT ?"
+SQL_BY_BOTH = SELECT_CONVERSATIONS_SQL + " WHERE agent_id = ? AND platform = ? ORDER BY timestamp DESC LIMIT ?"
+SELECT_CONVERSATIONS_BY_FILTER = {
+    (False, False): SQL_ALL,
+    (True, False): SQL_BY_AGENT,
+    (False, True): SQL_BY_PLATFORM,
+    (True, True): SQL_BY_BOTH,
+}
+
+# Version 1 stores conversation_data and metadata as UTF-8 JSON BLOBs, which
+# sqlite3 hands back as bytes the JSON parser reads without a str round trip.
+# Version 2 stores ids as the 16 raw UUID bytes instead of 36-character text.
+SCHEMA_VERSION = 2
+
+MIGRATE_JSON_TO_BLOB_SQL = '''
+    UPDATE conversations
+    SET conversation_data = CAST(conversation_data AS BLOB),
+        metadata = CAST(metadata AS BLOB)
+    WHERE typeof(conversation_data) = 'text'
+'''
+
 class ConversationDatabase:
     def __init__(self, db_path: str = None):
         """
@@ -43,27 +153,93 @@ class ConversationDatabase:
         if not db_path:
             db_path = os.path.expanduser('~/Library/Application Support/Letta/conversations.db')
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        
         self.db_path = db_path
+        self._local = threading.local()
+        self._shared_conn = None
+        # Serializes transactions on the shared connection; per-thread
+        # connections rely on SQLite's own locking instead
+        self._shared_lock = threading.Lock()
+        
+        if self.db_path == ':memory:':
+            # Every connection to ':memory:' is a separate database, so all
+            # threads have to share the one that holds the tables
+            self._shared_conn = self._connect(check_same_thread=False)
+        else:
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            # WAL lets readers proceed while a conversation is being written; the
+            # journal mode is stored in the database file, so it only needs setting once
+            self._conn().execute("PRAGMA journal_mode=WAL")
+        
         self._create_tables()
+    
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied."""
+        # Autocommit mode: transactions are opened explicitly by _transaction()
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread, isolation_level=None)
+        # NORMAL is durable in WAL mode except for the last commits on power loss
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
         
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block in a write transaction that takes the write lock up front,
+        so a busy database is waited out via busy_timeout rather than failing
+        when a deferred transaction tries to upgrade mid-way.
+        """
+        conn = self._conn()
+        with self._shared_lock if self._shared_conn is not None else nullcontext():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
     def _create_tables(self):
         """Create necessary tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id TEXT PRIMARY KEY,
-                    agent_id TEXT NOT NULL,
-                    platform TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    conversation_data TEXT NOT NULL,
-                    metadata TEXT
-                )
-            ''')
-            conn.commit()
+        with self._transaction() as conn:
+            conn.execute(CREATE_CONVERSATIONS_SQL)
+            indexed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_conv_agent_ts'"
+            ).fetchone()
+            for statement in CREATE_CONVERSATION_INDEXES_SQL:
+                conn.execute(statement)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                conn.execute(MIGRATE_JSON_TO_BLOB_SQL)
+            if version < 2:
+                self._migrate_text_ids(conn)
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # Gather statistics once so the planner knows to use the new indexes
+            if not indexed:
+                conn.execute("ANALYZE")
+    
+    @staticmethod
+    def _migrate_text_ids(conn: sqlite3.Connection):
+        """Rewrite text UUID ids as 16-byte BLOBs; ids that are not UUIDs stay text."""
+        updates = []
+        for (text_id,) in conn.execute("SELECT id FROM conversations WHERE typeof(id) = 'text'"):
+            try:
+                updates.append((uuid.UUID(text_id).bytes, text_id))
+            except ValueError:
+                continue
+        conn.executemany("UPDATE conversations SET id = ? WHERE id = ?", updates)
     
     def save_conversation(self, 
                           agent_id: str, 
@@ -82,31 +258,143 @@ class ConversationDatabase:
         Returns:
             Unique conversation ID
         """
-        conversation_id = str(uuid.uuid4())
+        conversation_id = uuid.uuid4()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO conversations 
-                    (id, agent_id, platform, conversation_data, metadata) 
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    conversation_id, 
+            with self._transaction() as conn:
+                conn.execute(INSERT_CONVERSATION_SQL, (
+                    conversation_id.bytes, 
                     agent_id, 
                     platform, 
-                    json.dumps(conversation_data), 
-                    json.dumps(metadata) if metadata else None
+                    _dumps(conversation_data), 
+                    _dumps(metadata) if metadata else None
                 ))
-                conn.commit()
             
             logger.info(f"Saved conversation {conversation_id} for agent {agent_id}")
-            return conversation_id
+            return str(conversation_id)
         
         except sqlite3.Error as e:
             logger.error(f"Error saving conversation: {e}")
             raise
     
+    def save_conversations(self, records: List[Dict]) -> List[str]:
+        """
+        Save several conversations in a single transaction.
+        
+        Args:
+            records: Dicts with 'agent_id', 'platform', 'conversation_data'
+                     and optional 'metadata'
+        
+        Returns:
+            Unique conversation IDs, in input order
+        """
+        # Serialize before touching the database so the write lock is held
+        # only for the inserts themselves
+        rows = [(
+            uuid.uuid4().bytes,
+            record['agent_id'],
+            record['platform'],
+            _dumps(record['conversation_data']),
+            _dumps(record['metadata']) if record.get('metadata') else None
+        ) for record in records]
+        
+        try:
+            with self._transaction() as conn:
+                conn.executemany(INSERT_CONVERSATION_SQL, rows)
+            
+            logger.info(f"Saved {len(rows)} conversations")
+            return [str(uuid.UUID(bytes=row[0])) for row in rows]
+        
+        except sqlite3.Error as e:
+            logger.error(f"Error saving conversations: {e}")
+            raise
+    
+    @contextmanager
+    def bulk_import(self):
+        """
+        Skip syncing to disk on this thread's connection for the duration of a
+        trusted bulk import. Conversations saved inside the block can be lost
+        if the machine crashes before it ends, so only use this for imports
+        that can be rerun; everything is flushed when the block exits.
+        """
+        conn = self._conn()
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            yield self
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Checkpointing under NORMAL syncs the WAL and then the database file
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    
+    def _select_conversations(self, 
+                              agent_id: Optional[str], 
+                              platform: Optional[str], 
+                              limit: int) -> sqlite3.Cursor:
+        """Run the listing query for the given filters and return its cursor."""
+        query = SELECT_CONVERSATIONS_BY_FILTER[bool(agent_id), bool(platform)]
+        params = [value for value in (agent_id, platform) if value]
+        params.append(limit)
+        
+        try:
+            return self._conn().execute(query, params)
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving conversations: {e}")
+            raise
+    
+    def iter_conversations(self, 
+                           agent_id: Optional[str] = None, 
+                           platform: Optional[str] = None, 
+                           limit: int = 100) -> Iterator[Dict]:
+        """
+        Iterate over conversations with optional filtering, decoding each
+        row only as it is consumed.
+        
+        Args:
+            agent_id: Filter by specific agent
+            platform: Filter by platform
+            limit: Maximum number of conversations to return
+        
+        Returns:
+            Iterator of conversation records; the query itself runs before
+            this returns, so database errors are raised here
+        """
+        cursor = self._select_conversations(agent_id, platform, limit)
+        return ({
+            'id': _format_id(conversation_id),
+            'agent_id': agent,
+            'platform': source,
+            'timestamp': timestamp,
+            'conversation_data': _loads(data),
+            'metadata': _loads(metadata) if metadata else None
+        } for conversation_id, agent, source, timestamp, data, metadata in cursor)
+    
+    def iter_conversations_json(self, 
+                                agent_id: Optional[str] = None, 
+                                platform: Optional[str] = None, 
+                                limit: int = 100,
+                                columnar: bool = False) -> Iterator[bytes]:
+        """
+        Iterate over conversations as encoded JSON. The stored conversation
+        and metadata JSON is spliced in as-is rather than parsed and re-encoded.
+        
+        Args:
+            agent_id: Filter by specific agent
+            platform: Filter by platform
+            limit: Maximum number of conversations to return
+            columnar: Emit each conversation as an array of values in
+                      CONVERSATION_COLUMNS order instead of an object
+        
+        Returns:
+            Iterator of UTF-8 JSON values, one per conversation
+        """
+        cursor = self._select_conversations(agent_id, platform, limit)
+        if columnar:
+            return (b'[' + b','.join(_encode_row(row)) + b']' for row in cursor)
+        return (
+            b'{' + b','.join(map(bytes.__add__, _CONVERSATION_KEYS, _encode_row(row))) + b'}'
+            for row in cursor
+        )
+    
     def get_conversations(self, 
                           agent_id: Optional[str] = None, 
                           platform: Optional[str] = None, 
@@ -122,91 +410,99 @@ class ConversationDatabase:
         Returns:
             List of conversation records
         """
-        query = "SELECT * FROM conversations"
-        conditions = []
-        params = []
-        
-        if agent_id:
-            conditions.append("agent_id = ?")
-            params.append(agent_id)
-        
-        if platform:
-            conditions.append("platform = ?")
-            params.append(platform)
-        
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
-        
-        query += f" ORDER BY timestamp DESC LIMIT {limit}"
-        
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                return [{
-                    'id': row['id'],
-                    'agent_id': row['agent_id'],
-                    'platform': row['platform'],
-                    'timestamp': row['timestamp'],
-                    'conversation_data': json.loads(row['conversation_data']),
-                    'metadata': json.loads(row['metadata']) if row['metadata'] else None
-                } for row in rows]
-        
-        except sqlite3.Error as e:
-            logger.error(f"Error retrieving conversations: {e}")
-            raise
+        return list(self.iter_conversations(agent_id, platform, limit))
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Load environment variables from multiple possible locations
-env_locations = [
-    ".env",  # Local environment file
-    "configs/.env",  # Docker environment file
-    os.path.expanduser("~/.letta/env")  # Global environment file
-]
-
-for env_path in env_locations:
-    if os.path.exists(env_path):
-        load_dotenv(env_path)
-        logger.info(f"Loaded environment variables from {env_path}")
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    """Load environment variables from the known env files, once per process"""
+    env_locations = [
+        ".env",  # Local environment file
+        "configs/.env",  # Docker environment file
+        os.path.expanduser("~/.letta/env")  # Global environment file
+    ]
+    
+    for env_path in env_locations:
+        if os.path.exists(env_path):
+            # Like load_dotenv, never override variables that are already set,
+            # so earlier files take precedence over later ones
+            for key, value in dotenv_values(env_path).items():
+                if value is not None:
+                    os.environ.setdefault(key, value)
+            logger.info(f"Loaded environment variables from {env_path}")
 
 # Default configurations
 DEFAULT_LETTA_URL = "http://localhost:8284"  # Updated to match our Docker port
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
-
 class LettaServerManager:
     """Main class for managing Letta server and Gemini agents"""
     
+    # Keep-alive connections held per host, so concurrent Flask handlers each
+    # reuse a pooled connection to the Letta API instead of opening a new one
+    POOL_SIZE = 32
+    STATUS_TIMEOUT = 1
+    REQUEST_TIMEOUT = 30
+    # Seconds that repeated status polls and agent listings are answered locally
+    STATUS_CACHE_TTL = 5
+    AGENTS_CACHE_TTL = 2
+    
     def __init__(self, letta_url: str = DEFAULT_LETTA_URL):
         """Initialize the manager with Letta server URL"""
+        _load_env()
         self.letta_url = letta_url
         self.api_url = f"{letta_url}/api/v1"
         self.headers = {"Content-Type": "application/json"}
         self.conversation_db = ConversationDatabase()
+        
+        # Retry only covers connection errors and idempotent methods by default,
+        # so a POST that reached the server is never sent twice
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+        )
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # (expiry on the monotonic clock, value) pairs; None until first fetched
+        self._status_cache = None
+        self._agents_cache = None
     
     def check_server_status(self) -> bool:
         """Check if Letta server is running"""
+        cached = self._status_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
         try:
-            import requests
-            response = requests.get(self.letta_url)
-            return response.status_code == 200
+            # Only the status line is needed, so ask for headers alone
+            response = self.session.head(self.letta_url, timeout=self.STATUS_TIMEOUT, allow_redirects=False)
+            if response.status_code in (405, 501):
+                # HEAD not supported; GET but close before reading the body
+                with self.session.get(self.letta_url, timeout=self.STATUS_TIMEOUT, stream=True, allow_redirects=False) as response:
+                    pass
+            # Redirects are not followed, so a root that answers 3xx still counts as up
+            running = response.status_code < 400
         except Exception:
-            return False
+            running = False
+        self._status_cache = (time.monotonic() + self.STATUS_CACHE_TTL, running)
+        return running
     
     def list_agents(self) -> List[Dict[str, Any]]:
         """List all agents in Letta"""
+        cached = self._agents_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
         try:
-            import requests
-            response = requests.get(f"{self.api_url}/agents", headers=self.headers)
+            response = self.session.get(f"{self.api_url}/agents", timeout=self.REQUEST_TIMEOUT)
             if response.status_code == 200:
-                return response.json()
+                agents = response.json()
+                # Failures are not cached, so the next call retries straight away
+                self._agents_cache = (time.monotonic() + self.AGENTS_CACHE_TTL, agents)
+                return agents
             else:
                 logger.error(f"Failed to list agents: {response.status_code} - {response.text}")
                 return []
@@ -217,15 +513,15 @@ class LettaServerManager:
     def create_agent(self, name: str, description: str, system_prompt: str, model_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a new agent in Letta"""
         try:
-            import requests
             agent_data = {
                 "name": name,
                 "description": description,
                 "system_prompt": system_prompt,
                 "model_config": model_config
             }
-            response = requests.post(f"{self.api_url}/agents", headers=self.headers, json=agent_data)
+            response = self.session.post(f"{self.api_url}/agents", json=agent_data, timeout=self.REQUEST_TIMEOUT)
             if response.status_code == 201:
+                self._agents_cache = None
                 return response.json()
             else:
                 logger.error(f"Failed to create agent: {response.status_code} - {response.text}")
@@ -237,9 +533,13 @@ class LettaServerManager:
     def delete_agent(self, agent_id: str) -> bool:
         """Delete an agent from Letta"""
         try:
-            import requests
-            response = requests.delete(f"{self.api_url}/agents/{agent_id}", headers=self.headers)
-            return response.status_code == 204
+            with self.session.delete(
+                f"{self.api_url}/agents/{agent_id}", timeout=self.REQUEST_TIMEOUT, stream=True
+            ) as response:
+                deleted = response.status_code == 204
+            if deleted:
+                self._agents_cache = None
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting agent: {e}")
             return False
@@ -247,8 +547,7 @@ class LettaServerManager:
     def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get an agent from Letta"""
         try:
-            import requests
-            response = requests.get(f"{self.api_url}/agents/{agent_id}", headers=self.headers)
+            response = self.session.get(f"{self.api_url}/agents/{agent_id}", timeout=self.REQUEST_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -277,6 +576,19 @@ class LettaServerManager:
         """
         return self.conversation_db.save_conversation(agent_id, platform, conversation_data, metadata)
     
+    def save_conversations(self, records: List[Dict]) -> List[str]:
+        """
+        Save several conversations in a single transaction.
+        
+        Args:
+            records: Dicts with 'agent_id', 'platform', 'conversation_data'
+                     and optional 'metadata'
+        
+        Returns:
+            Unique conversation IDs, in input order
+        """
+        return self.conversation_db.save_conversations(records)
+    
     def get_conversations(self, 
                           agent_id: Optional[str] = None, 
                           platform: Optional[str] = None, 
@@ -293,75 +605,169 @@ class LettaServerManager:
             List of conversation records
         """
         return self.conversation_db.get_conversations(agent_id, platform, limit)
+    
+    def iter_conversations(self, 
+                           agent_id: Optional[str] = None, 
+                           platform: Optional[str] = None, 
+                           limit: int = 100) -> Iterator[Dict]:
+        """
+        Iterate over conversations with optional filtering.
+        
+        Args:
+            agent_id: Filter by specific agent
+            platform: Filter by platform
+            limit: Maximum number of conversations to return
+        
+        Returns:
+            Iterator of conversation records
+        """
+        return self.conversation_db.iter_conversations(agent_id, platform, limit)
+    
+    def iter_conversations_json(self, 
+                                agent_id: Optional[str] = None, 
+                                platform: Optional[str] = None, 
+                                limit: int = 100,
+                                columnar: bool = False) -> Iterator[bytes]:
+        """
+        Iterate over conversations as encoded JSON.
+        
+        Args:
+            agent_id: Filter by specific agent
+            platform: Filter by platform
+            limit: Maximum number of conversations to return
+            columnar: Emit arrays in CONVERSATION_COLUMNS order instead of objects
+        
+        Returns:
+            Iterator of UTF-8 JSON values, one per conversation
+        """
+        return self.conversation_db.iter_conversations_json(agent_id, platform, limit, columnar)
+
+# Routes share one manager per process, created on first use so importing this
+# module (or a gunicorn master that forks workers) never opens the database
+_manager = None
+_manager_lock = threading.Lock()
+
+def _get_manager() -> LettaServerManager:
+    """Return the process-wide manager used by the Flask routes"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = LettaServerManager()
+    return _manager
+
+def _create_app():
+    """Build the Flask app; Flask is only imported when the web server is used"""
+    from flask import Flask, Response, jsonify, request
+    from flask_cors import CORS
+    
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for all routes
+    if orjson is not None:
+        from letta_server._json_provider import OrjsonProvider
+        app.json = OrjsonProvider(app)
+    
+    @app.route("/")
+    def index():
+        """Health check endpoint"""
+        return jsonify({"status": "ok", "message": "Letta server is running"})
+
+    @app.route("/api/v1/agents", methods=["GET"])
+    def list_agents():
+        """List all agents"""
+        manager = _get_manager()
+        return jsonify(manager.list_agents())
+
+    @app.route("/api/v1/agents", methods=["POST"])
+    def create_agent():
+        """Create a new agent"""
+        data = request.json
+        manager = _get_manager()
+        result = manager.create_agent(
+            name=data["name"],
+            description=data["description"],
+            system_prompt=data["system_prompt"],
+            model_config=data["model_config"]
+        )
+        if result:
+            return jsonify(result), 201
+        return jsonify({"error": "Failed to create agent"}), 400
+
+    @app.route("/api/v1/agents/<agent_id>", methods=["GET"])
+    def get_agent(agent_id):
+        """Get an agent by ID"""
+        manager = _get_manager()
+        result = manager.get_agent(agent_id)
+        if result:
+            return jsonify(result)
+        return jsonify({"error": "Agent not found"}), 404
+
+    @app.route("/api/v1/agents/<agent_id>", methods=["DELETE"])
+    def delete_agent(agent_id):
+        """Delete an agent by ID"""
+        manager = _get_manager()
+        if manager.delete_agent(agent_id):
+            return "", 204
+        return jsonify({"error": "Failed to delete agent"}), 400
+
+    @app.route("/api/v1/conversations", methods=["POST"])
+    def save_conversation():
+        """Save a conversation"""
+        data = request.json
+        manager = _get_manager()
+        conversation_id = manager.save_conversation(
+            agent_id=data["agent_id"],
+            platform=data["platform"],
+            conversation_data=data["conversation_data"],
+            metadata=data.get("metadata")
+        )
+        if conversation_id:
+            return jsonify({"conversation_id": conversation_id}), 201
+        return jsonify({"error": "Failed to save conversation"}), 400
+
+    @app.route("/api/v1/conversations/bulk", methods=["POST"])
+    def save_conversations():
+        """Save several conversations at once"""
+        data = request.json
+        if not isinstance(data, list) or not all(
+            isinstance(record, dict) and {"agent_id", "platform", "conversation_data"} <= record.keys()
+            for record in data
+        ):
+            return jsonify({"error": "Expected a list of conversations"}), 400
+        manager = _get_manager()
+        conversation_ids = manager.save_conversations(data)
+        return jsonify({"conversation_ids": conversation_ids}), 201
+
+    @app.route("/api/v1/conversations", methods=["GET"])
+    def get_conversations():
+        """Get conversations"""
+        manager = _get_manager()
+        agent_id = request.args.get("agent_id")
+        platform = request.args.get("platform")
+        limit = int(request.args.get("limit", 100))
+        # Columnar responses name the keys once instead of in every conversation
+        columnar = request.args.get("format") == "columnar"
+        conversations = manager.iter_conversations_json(agent_id, platform, limit, columnar)
+    
+        def generate():
+            # Send one conversation at a time instead of building the whole list
+            yield b'{"columns":' + _dumps(CONVERSATION_COLUMNS) + b',"rows":[' if columnar else b"["
+            for i, conversation in enumerate(conversations):
+                yield (b"," if i else b"") + conversation
+            yield b"]}" if columnar else b"]"
+    
+        return Response(generate(), mimetype="application/json")
+    
+    return app
 
-# Flask routes
-@app.route("/")
-def index():
-    """Health check endpoint"""
-    return jsonify({"status": "ok", "message": "Letta server is running"})
-
-@app.route("/api/v1/agents", methods=["GET"])
-def list_agents():
-    """List all agents"""
-    manager = LettaServerManager()
-    return jsonify(manager.list_agents())
-
-@app.route("/api/v1/agents", methods=["POST"])
-def create_agent():
-    """Create a new agent"""
-    data = request.json
-    manager = LettaServerManager()
-    result = manager.create_agent(
-        name=data["name"],
-        description=data["description"],
-        system_prompt=data["system_prompt"],
-        model_config=data["model_config"]
-    )
-    if result:
-        return jsonify(result), 201
-    return jsonify({"error": "Failed to create agent"}), 400
-
-@app.route("/api/v1/agents/<agent_id>", methods=["GET"])
-def get_agent(agent_id):
-    """Get an agent by ID"""
-    manager = LettaServerManager()
-    result = manager.get_agent(agent_id)
-    if result:
-        return jsonify(result)
-    return jsonify({"error": "Agent not found"}), 404
-
-@app.route("/api/v1/agents/<agent_id>", methods=["DELETE"])
-def delete_agent(agent_id):
-    """Delete an agent by ID"""
-    manager = LettaServerManager()
-    if manager.delete_agent(agent_id):
-        return "", 204
-    return jsonify({"error": "Failed to delete agent"}), 400
-
-@app.route("/api/v1/conversations", methods=["POST"])
-def save_conversation():
-    """Save a conversation"""
-    data = request.json
-    manager = LettaServerManager()
-    conversation_id = manager.save_conversation(
-        agent_id=data["agent_id"],
-        platform=data["platform"],
-        conversation_data=data["conversation_data"],
-        metadata=data.get("metadata")
-    )
-    if conversation_id:
-        return jsonify({"conversation_id": conversation_id}), 201
-    return jsonify({"error": "Failed to save conversation"}), 400
-
-@app.route("/api/v1/conversations", methods=["GET"])
-def get_conversations():
-    """Get conversations"""
-    manager = LettaServerManager()
-    agent_id = request.args.get("agent_id")
-    platform = request.args.get("platform")
-    limit = int(request.args.get("limit", 100))
-    conversations = manager.get_conversations(agent_id, platform, limit)
-    return jsonify(conversations)
+def __getattr__(name: str):
+    # WSGI servers look up "app" (letta_server_manager:app); build it on first
+    # access so CLI commands never import Flask
+    if name == "app":
+        global app
+        app = _create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def main():
     parser = argparse.ArgumentParser(description="Letta Server Manager")
@@ -397,6 +803,12 @@ def main():
     save_conversation_parser.add_argument("--platform", required=True, help="Platform")
     save_conversation_parser.add_argument("--conversation-data", required=True, help="Conversation data")
 
+    # Import conversations command
+    import_conversations_parser = subparsers.add_parser(
+        "import-conversations", help="Bulk import conversations from a JSON file (not crash-safe until it finishes)"
+    )
+    import_conversations_parser.add_argument("--file", required=True, help="JSON array of conversations")
+
     # Get conversations command
     get_conversations_parser = subparsers.add_parser("get-conversations", help="Get conversations")
     get_conversations_parser.add_argument("--agent-id", help="Agent ID")
@@ -458,6 +870,13 @@ def main():
         else:
             print("Failed to save conversation")
 
+    elif args.command == "import-conversations":
+        with open(args.file, "rb") as f:
+            records = _loads(f.read())
+        with manager.conversation_db.bulk_import() as conversation_db:
+            conversation_ids = conversation_db.save_conversations(records)
+        print(f"Imported {len(conversation_ids)} conversations")
+
     elif args.command == "get-conversations":
         conversations = manager.get_conversations(
             agent_id=args.agent_id,
@@ -472,10 +891,11 @@ def main():
             print("No conversations found")
 
 if __name__ == "__main__":
+    _load_env()
     if os.environ.get("FLASK_APP"):
         # Running as a web server
         port = int(os.environ.get("LETTA_PORT", 8283))
-        app.run(host="0.0.0.0", port=port)
+        _create_app().run(host="0.0.0.0", port=port, threaded=True)
     else:
         # Running as a CLI tool
         main()
@@ -0,0 +1 @@
+"""Letta/Gemini setup, integration and maintenance scripts."""
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Shared agent endpoint discovery for the Letta agent creation scripts.
+
+Letta servers expose the agents collection under one of several paths. The path
+that worked last time is remembered per server in ~/.letta/endpoint_cache.json,
+so later runs try it first instead of probing every candidate again.
+"""
+
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+ENDPOINT_CACHE_PATH = os.path.expanduser("~/.letta/endpoint_cache.json")
+
+# Answers to a HEAD probe that show the route exists; 405 means it exists but has no HEAD handler
+ENDPOINT_PRESENT_STATUSES = (200, 204, 405)
+
+# Gateway errors are retried in place before moving on to the next candidate endpoint
+RETRY_STATUSES = (502, 503, 504)
+
+def agent_retry() -> 'Retry':
+    """
+    Build the retry policy for the agent scripts' sessions
+
+    Connection errors are retried for every method; status retries only cover
+    idempotent methods, so a POST that reached the server is never sent twice.
+    Once retries run out the last response is returned rather than raised, so
+    the caller can fall back to the next endpoint.
+
+    :return: Retry with exponential backoff, plus jitter where urllib3 supports it
+    """
+    from urllib3.util.retry import Retry
+    
+    options = dict(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    try:
+        return Retry(backoff_jitter=0.5, **options)
+    except TypeError:
+        # urllib3 < 2 has no backoff_jitter
+        return Retry(**options)
+
+def _load_endpoint_cache() -> Dict[str, str]:
+    """
+    Load the endpoint cache
+
+    :return: Mapping of server base URL to its agents endpoint path
+    """
+    try:
+        with open(ENDPOINT_CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_endpoint_cache(cache: Dict[str, str]) -> None:
+    """
+    Write the endpoint cache atomically; failures only cost a re-probe next time
+
+    :param cache: Mapping of server base URL to its agents endpoint path
+    """
+    cache_dir = os.path.dirname(ENDPOINT_CACHE_PATH)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # A private temp file per writer, so concurrent saves never share a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.endpoint_cache.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, ENDPOINT_CACHE_PATH)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+def cached_endpoint(base_url: str, endpoints: Sequence[str]) -> Optional[str]:
+    """
+    Get the remembered endpoint for a server, if it is one of the candidates
+
+    :param base_url: Server base URL
+    :param endpoints: Candidate endpoint paths
+    :return: Cached endpoint path or None
+    """
+    endpoint = _load_endpoint_cache().get(base_url)
+    return endpoint if endpoint in endpoints else None
+
+def prefer_cached(endpoints: Sequence[str], cached: Optional[str]) -> List[str]:
+    """
+    Order candidate endpoints with the remembered one first
+
+    :param endpoints: Candidate endpoint paths in preference order
+    :param cached: Endpoint returned by cached_endpoint, or None
+    :return: Candidates with the cached endpoint moved to the front
+    """
+    if cached is None:
+        return list(endpoints)
+    return [cached] + [endpoint for endpoint in endpoints if endpoint != cached]
+
+def remember_endpoint(base_url: str, endpoint: str) -> None:
+    """
+    Remember the endpoint that worked for a server
+
+    :param base_url: Server base URL
+    :param endpoint: Endpoint path that answered successfully
+    """
+    cache = _load_endpoint_cache()
+    if cache.get(base_url) != endpoint:
+        cache[base_url] = endpoint
+        _save_endpoint_cache(cache)
+
+def forget_endpoint(base_url: str, endpoint: str) -> None:
+    """
+    Drop a remembered endpoint that no longer exists on the server
+
+    :param base_url: Server base URL
+    :param endpoint: Endpoint path that answered 404
+    """
+    cache = _load_endpoint_cache()
+    if cache.get(base_url) == endpoint:
+        del cache[base_url]
+        _save_endpoint_cache(cache)
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body as compact JSON; orjson when available, json otherwise"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def try_endpoints(
+    session: 'requests.Session',
+    method: str,
+    base_url: str,
+    endpoints: Sequence[str],
+    timeout: float,
+    success_statuses: Tuple[int, ...] = (200,),
+    on_attempt: Optional[Callable[[str, Union['requests.Response', Exception]], None]] = None,
+    **kwargs: Any
+) -> Optional[Tuple[str, 'requests.Response']]:
+    """
+    Send a request to the first candidate endpoint that serves it
+
+    GET fetches the remembered endpoint directly; otherwise it discovers the route
+    with concurrent bodyless HEAD probes and sends the real GET to the first endpoint
+    present in preference order. Other methods, such as the POST that creates an
+    agent, go to one candidate at a time (remembered endpoint first) so the server
+    never acts on them twice. The endpoint that succeeds is remembered, and a
+    remembered endpoint answering 404 is forgotten.
+
+    :param session: Session to send the requests with
+    :param method: HTTP method of the real request
+    :param base_url: Server base URL
+    :param endpoints: Candidate endpoint paths in preference order
+    :param timeout: Timeout for each request
+    :param success_statuses: Status codes that count as success
+    :param on_attempt: Called with the URL and the final response or error of each candidate tried
+    :param kwargs: Passed on to session.request for the real request; a json body is encoded once
+                   up front rather than again for every candidate
+    :return: Tuple of the endpoint path and its successful response, or None if no endpoint served it
+    :raises requests.RequestException: If no candidate could be reached at all
+    """
+    if 'json' in kwargs:
+        kwargs['data'] = _dumps(kwargs.pop('json'))
+        kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+
+    cached = cached_endpoint(base_url, endpoints)
+    last_error = None
+    answered = False
+
+    def send(endpoint: str, request_method: str, **request_kwargs: Any) -> 'requests.Response':
+        return session.request(request_method, f"{base_url}{endpoint}", timeout=timeout, **request_kwargs)
+
+    def attempt(endpoint: str, get_response: Callable[[], 'requests.Response']) -> Optional['requests.Response']:
+        nonlocal last_error, answered
+        url = f"{base_url}{endpoint}"
+        try:
+            response = get_response()
+        except Exception as e:
+            last_error = e
+            if on_attempt is not None:
+                on_attempt(url, e)
+            return None
+        answered = True
+        if on_attempt is not None:
+            on_attempt(url, response)
+        if response.status_code in success_statuses:
+            remember_endpoint(base_url, endpoint)
+            return response
+        if response.status_code == 404 and endpoint == cached:
+            forget_endpoint(base_url, endpoint)
+        return None
+
+    if method != "GET":
+        for endpoint in prefer_cached(endpoints, cached):
+            response = attempt(endpoint, lambda: send(endpoint, method, **kwargs))
+            if response is not None:
+                return endpoint, response
+    else:
+        remaining = list(endpoints)
+        if cached is not None:
+            response = attempt(cached, lambda: send(cached, "GET", **kwargs))
+            if response is not None:
+                return cached, response
+            remaining.remove(cached)
+
+        if remaining:
+            executor = ThreadPoolExecutor(max_workers=len(remaining))
+            probes = [executor.submit(send, endpoint, "HEAD") for endpoint in remaining]
+            try:
+                for endpoint, probe in zip(remaining, probes):
+                    def fetch() -> 'requests.Response':
+                        head = probe.result()
+                        if head.status_code in ENDPOINT_PRESENT_STATUSES:
+                            return send(endpoint, "GET", **kwargs)
+                        return head
+
+                    response = attempt(endpoint, fetch)
+                    if response is not None:
+                        return endpoint, response
+            finally:
+                # Don't wait on the probes that are no longer needed
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    if not answered and last_error is not None:
+        raise last_error
+    return None
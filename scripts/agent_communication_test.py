@@ -2,6 +2,7 @@
 import os
 import sys
 import json
+import asyncio
 import logging
 from typing import Dict, Any
 
@@ -53,7 +54,7 @@ class LettaAgentCommunicationTest:
         
         :param name: Name of the agent
         :param system_prompt: Initial system prompt defining agent's role
-        :return: Configured Gemini model
+        :return: Configured Gemini model; start a chat per conversation
         """
         model = genai.GenerativeModel(
             'gemini-2.0-flash',
@@ -63,12 +64,9 @@ class LettaAgentCommunicationTest:
             ),
             system_instruction=system_prompt
         )
-        
-        # Start a chat session
-        chat = model.start_chat(history=[])
-        return chat
+        return model
     
-    def simulate_conversation(self, topic: str) -> Dict[str, Any]:
+    async def simulate_conversation(self, topic: str) -> Dict[str, Any]:
         """
         Simulate a conversation between two agents
         
@@ -76,14 +74,19 @@ class LettaAgentCommunicationTest:
         :return: Conversation results
         """
         try:
+            # Each topic gets its own chats so concurrent conversations
+            # don't interleave in a shared history
+            researcher_chat = self.researcher_agent.start_chat(history=[])
+            creative_chat = self.creative_agent.start_chat(history=[])
+            
             # Research agent provides initial detailed information
-            research_response = self.researcher_agent.send_message(
+            research_response = await researcher_chat.send_message_async(
                 f"Provide a comprehensive, scientific overview of {topic}. "
                 "Include key facts, research findings, and current understanding."
             )
             
             # Creative agent interprets the research
-            creative_response = self.creative_agent.send_message(
+            creative_response = await creative_chat.send_message_async(
                 f"Interpret this research about {topic} in an engaging way. "
                 f"Make it accessible and interesting:\n\n{research_response.text}"
             )
@@ -101,7 +104,7 @@ class LettaAgentCommunicationTest:
                 'error': str(e)
             }
     
-    def run_test(self):
+    async def run_test(self):
         """
         Run the agent communication test
         """
@@ -115,12 +118,15 @@ class LettaAgentCommunicationTest:
             "Quantum Computing Advancements"
         ]
         
-        for topic in test_topics:
+        # Topics are independent, so run them all at once and report in order
+        results = await asyncio.gather(
+            *(self.simulate_conversation(topic) for topic in test_topics)
+        )
+        
+        for topic, result in zip(test_topics, results):
             print(f"\n📍 Topic: {topic}")
             print("-" * 50)
             
-            result = self.simulate_conversation(topic)
-            
             if result['success']:
                 print("🔬 Research Perspective:")
                 print(result['research_response'][:500] + "...\n")
@@ -132,7 +138,7 @@ class LettaAgentCommunicationTest:
 
 def main():
     communication_test = LettaAgentCommunicationTest()
-    communication_test.run_test()
+    asyncio.run(communication_test.run_test())
 
 if __name__ == '__main__':
     main()
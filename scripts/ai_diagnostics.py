@@ -23,6 +23,8 @@ class AITroubleshooter:
             
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-2.0-flash')
+        # The system prompt never changes, so build the analysis preamble once
+        self._analysis_preamble = self._create_system_prompt() + "\n\nAnalyze this system status and provide recommendations:\n\n"
         
     def _create_system_prompt(self) -> str:
         """Create a system prompt for the AI model."""
@@ -37,13 +39,14 @@ Format your response in markdown with clear sections:
 
     def _format_check_results(self, results: List[Dict]) -> str:
         """Format check results for AI analysis."""
-        formatted = "### System Status\n"
+        lines = ["### System Status"]
         for result in results:
             status = "✅" if result['passed'] else "❌"
-            formatted += f"{status} {result['message']}\n"
+            lines.append(f"{status} {result['message']}")
             if not result['passed'] and result.get('error_details'):
-                formatted += f"Error: {result['error_details']}\n"
-        return formatted
+                lines.append(f"Error: {result['error_details']}")
+        lines.append("")
+        return "\n".join(lines)
 
     def _format_logs(self, logs: str) -> str:
         """Format log entries for AI analysis."""
@@ -53,11 +56,12 @@ Format your response in markdown with clear sections:
         """Format repair history for AI analysis."""
         if not repairs:
             return ""
-        formatted = "### Recent Repair Attempts\n"
+        lines = ["### Recent Repair Attempts"]
         for repair in repairs:
             status = "✅" if repair['success'] else "❌"
-            formatted += f"{repair['timestamp']} - {status} {repair['component']}: {repair['action']}\n"
-        return formatted
+            lines.append(f"{repair['timestamp']} - {status} {repair['component']}: {repair['action']}")
+        lines.append("")
+        return "\n".join(lines)
 
     async def analyze_issues(self, 
                            check_results: List[Dict],
@@ -95,7 +99,7 @@ Format your response in markdown with clear sections:
 """)
 
         # Generate analysis
-        prompt = self._create_system_prompt() + "\n\nAnalyze this system status and provide recommendations:\n\n" + "\n".join(context)
+        prompt = self._analysis_preamble + "\n".join(context)
         
         try:
             response = await self.model.generate_content_async(prompt)
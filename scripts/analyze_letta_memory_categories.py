@@ -2,7 +2,57 @@
 import os
 import json
 import sys
-from typing import Dict, List, Any
+from collections import Counter
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses the raw bytes directly; json.loads accepts bytes as well
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Keys each category may be stored under, in order of preference
+ENTRY_KEYS = ('entry_type', 'entryType', 'type')
+TOPIC_KEYS = ('topic', 'title', 'subject')
+TAG_KEYS = ('tags', 'categories', 'labels')
+DOMAIN_KEYS = ('domain', 'category', 'field')
+
+# Only these keys are ever read, so payload fields are dropped right after parsing
+MEMORY_KEYS = frozenset(ENTRY_KEYS + TOPIC_KEYS + TAG_KEYS + DOMAIN_KEYS)
+
+def _read_memory_file(path: str) -> Tuple[Any, Optional[Exception]]:
+    """
+    Read and parse one memory file
+    
+    :param path: Memory file path
+    :return: Tuple of the parsed memory and None, or None and the error that occurred
+    """
+    try:
+        with open(path, 'rb') as f:
+            memory = _loads(f.read())
+    except (OSError, ValueError) as e:
+        return None, e
+    if isinstance(memory, dict):
+        memory = {key: value for key, value in memory.items() if key in MEMORY_KEYS}
+    return memory, None
+
+def _first_key(memory: Dict[str, Any], keys: Tuple[str, ...], default: Any) -> Any:
+    """
+    Look up the first of several keys present in a memory
+    
+    :param memory: Parsed memory
+    :param keys: Candidate keys, in order of preference
+    :param default: Value returned when none of the keys is present
+    :return: Value of the first present key, or the default
+    """
+    for key in keys:
+        if key in memory:
+            return memory[key]
+    return default
 
 class LettaMemoryCategorizer:
     def __init__(self, memory_dir: str = None):
@@ -13,6 +63,8 @@ class LettaMemoryCategorizer:
         """
         self.memory_dir = memory_dir or os.path.expanduser('~/.letta/memories')
         self.memories = self._load_memories()
+        # Category counts, computed on first use by _analyze_all
+        self._categories = None
     
     def _load_memories(self) -> List[Dict[str, Any]]:
         """
@@ -20,20 +72,26 @@ class LettaMemoryCategorizer:
         
         :return: List of memory contents
         """
+        with os.scandir(self.memory_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith('.json')]
+        
+        # Reads and parses release the GIL, so files load in parallel; map keeps directory order
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            results = list(executor.map(_read_memory_file, paths))
+        
         memories = []
-        for filename in os.listdir(self.memory_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.memory_dir, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        memories.append(json.load(f))
-                except Exception as e:
-                    print(f"Error reading {filename}: {e}")
+        for path, (memory, error) in zip(paths, results):
+            if error is not None:
+                print(f"Error reading {os.path.basename(path)}: {error}")
+            else:
+                memories.append(memory)
         return memories
     
-    def analyze_categorization(self):
+    def analyze_categorization(self, top_tags: Optional[int] = None):
         """
         Analyze how memories are categorized
+        
+        :param top_tags: Number of most frequent tags to show, or None for all tags
         """
         print("🧠 Letta Memory Categorization Analysis 🧠")
         print("=========================================")
@@ -42,7 +100,7 @@ class LettaMemoryCategorizer:
         categorization_methods = {
             'Entry Types': self._analyze_entry_types(),
             'Topics': self._analyze_topics(),
-            'Tags': self._analyze_tags(),
+            'Tags': self._analyze_tags(top_tags),
             'Domains': self._analyze_domains()
         }
         
@@ -57,21 +115,49 @@ class LettaMemoryCategorizer:
             else:
                 print(details)
     
+    def _analyze_all(self) -> Dict[str, Counter]:
+        """
+        Count entry types, topics, tags and domains in a single pass over the memories
+        
+        :return: Counters keyed by 'entry_types', 'topics', 'tags' and 'domains'
+        """
+        if self._categories is not None:
+            return self._categories
+        
+        entry_types, topics, domains = Counter(), Counter(), Counter()
+        tag_lists = []
+        for memory in self.memories:
+            # Loaded dicts are already trimmed to MEMORY_KEYS, so an empty one has no
+            # category keys; non-object files have none either and count as Unknown
+            if not isinstance(memory, dict) or not memory:
+                entry_types['Unknown'] += 1
+                topics['Unknown'] += 1
+                domains['Unknown'] += 1
+                continue
+            # Each category may be stored under any of several keys; the first present wins
+            entry_types[_first_key(memory, ENTRY_KEYS, 'Unknown')] += 1
+            topics[_first_key(memory, TOPIC_KEYS, 'Unknown')] += 1
+            tag_lists.append(_first_key(memory, TAG_KEYS, []))
+            domains[_first_key(memory, DOMAIN_KEYS, 'Unknown')] += 1
+        
+        # Count every tag in one C-level pass rather than one update() call per memory
+        tags = Counter(chain.from_iterable(tag_lists))
+        
+        self._categories = {
+            'entry_types': entry_types,
+            'topics': topics,
+            'tags': tags,
+            'domains': domains
+        }
+        return self._categories
+    
     def _analyze_entry_types(self) -> Dict[str, int]:
         """
         Analyze different entry types in memories
         
         :return: Dictionary of entry types and their counts
         """
-        entry_types = {}
-        for memory in self.memories:
-            # Check for different possible entry type keys
-            type_keys = ['entry_type', 'entryType', 'type']
-            entry_type = next((memory.get(key, 'Unknown') for key in type_keys if key in memory), 'Unknown')
-            
-            entry_types[entry_type] = entry_types.get(entry_type, 0) + 1
-        
-        return entry_types
+        return self._analyze_all()['entry_types']
     
     def _analyze_topics(self) -> Dict[str, int]:
         """
@@ -79,37 +165,18 @@ class LettaMemoryCategorizer:
         
         :return: Dictionary of topics and their counts
         """
-        topics = {}
-        for memory in self.memories:
-            # Check for different possible topic keys
-            topic_keys = ['topic', 'title', 'subject']
-            topic = next((memory.get(key, 'Unknown') for key in topic_keys if key in memory), 'Unknown')
-            
-            topics[topic] = topics.get(topic, 0) + 1
-        
-        return topics
+        return self._analyze_all()['topics']
     
-    def _analyze_tags(self) -> str:
+    def _analyze_tags(self, top_n: Optional[int] = None) -> str:
         """
         Analyze tags associated with memories
         
+        :param top_n: Number of most frequent tags to include, or None for all tags
         :return: String description of tags
         """
-        all_tags = []
-        for memory in self.memories:
-            # Check for different possible tag keys
-            tag_keys = ['tags', 'categories', 'labels']
-            tags = next((memory.get(key, []) for key in tag_keys if key in memory), [])
-            
-            all_tags.extend(tags)
-        
-        # Count and sort tags
-        tag_counts = {}
-        for tag in all_tags:
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        
-        # Sort tags by frequency
-        sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
+        # Sort tags by frequency; ties keep first-seen order. With a limit, most_common
+        # selects through heapq.nlargest instead of sorting every distinct tag
+        sorted_tags = self._analyze_all()['tags'].most_common(top_n)
         
         return "\n".join([f"{tag}: {count}" for tag, count in sorted_tags]) if sorted_tags else "No tags found"
     
@@ -119,19 +186,13 @@ class LettaMemoryCategorizer:
         
         :return: Dictionary of domains and their counts
         """
-        domains = {}
-        for memory in self.memories:
-            # Check for different possible domain keys
-            domain_keys = ['domain', 'category', 'field']
-            domain = next((memory.get(key, 'Unknown') for key in domain_keys if key in memory), 'Unknown')
-            
-            domains[domain] = domains.get(domain, 0) + 1
-        
-        return domains
+        return self._analyze_all()['domains']
     
-    def generate_memory_report(self):
+    def generate_memory_report(self, top_tags: Optional[int] = 20):
         """
         Generate a comprehensive memory categorization report
+        
+        :param top_tags: Number of most frequent tags to show, or None for all tags
         """
         print("📊 Letta Memory Categorization Report 📊")
         print("======================================")
@@ -140,7 +201,7 @@ class LettaMemoryCategorizer:
         print(f"Total Memories: {len(self.memories)}")
         
         # Detailed analysis
-        self.analyze_categorization()
+        self.analyze_categorization(top_tags=top_tags)
 
 def main():
     categorizer = LettaMemoryCategorizer()
@@ -6,13 +6,17 @@ Monitors essential components and attempts to fix common issues automatically.
 import os
 import sys
 import json
+import mmap
+import functools
 import time
 import asyncio
 import requests
 import subprocess
+import http.client
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from ai_diagnostics import AITroubleshooter
+import docker_api
 
 class LettaRepair:
     def __init__(self, project_root: str):
@@ -80,6 +84,39 @@ class LettaRepair:
             print(f"Failed to reload launch agent: {e}")
             return False
 
+# Repairs keyed by error code: (repair method, component, action, success message).
+# Codes not listed here have no automatic repair; log file errors are handled separately
+# because the repair needs the file name.
+_RESTART_CONTAINER = (LettaRepair.restart_docker_container, "Docker", "Restart container", "Restarted Docker container")
+_RELOAD_LAUNCH_AGENT = (LettaRepair.reload_launch_agent, "LaunchAgent", "Reload configuration", "Reloaded launch agent")
+REPAIR_TABLE = {
+    "daemon_not_running": (LettaRepair.start_docker_daemon, "Docker", "Start daemon", "Started Docker daemon"),
+    "container_not_running": _RESTART_CONTAINER,
+    "connection_failed": _RESTART_CONTAINER,
+    "unhealthy_response": _RESTART_CONTAINER,
+    "plist_missing": _RELOAD_LAUNCH_AGENT,
+    "not_loaded": _RELOAD_LAUNCH_AGENT,
+    "autostart_error": _RELOAD_LAUNCH_AGENT,
+}
+
+# Initial tail window for log reads, doubled until it holds enough lines
+LOG_TAIL_WINDOW = 64 * 1024
+LOG_TAIL_MAX_WINDOW = 4 * 1024 * 1024
+
+def _tail_lines(path: str, lines: int) -> List[str]:
+    """Read the last lines of a file by seeking from the end instead of reading all of it."""
+    size = os.path.getsize(path)
+    window = LOG_TAIL_WINDOW
+    with open(path, 'rb') as f:
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            tail = f.read(size - start).decode('utf-8', 'replace').splitlines(keepends=True)
+            # The first line of a partial window may be cut off, so it only counts at offset 0
+            if start == 0 or len(tail) > lines or window >= LOG_TAIL_MAX_WINDOW:
+                return tail[-lines:]
+            window *= 2
+
 def get_recent_logs(lines: int = 50) -> str:
     """Get recent lines from the Letta server logs."""
     log_file = os.path.expanduser("~/Library/Logs/letta-server.log")
@@ -89,38 +126,67 @@ def get_recent_logs(lines: int = 50) -> str:
     for file in [log_file, error_log]:
         try:
             if os.path.exists(file):
-                with open(file, 'r') as f:
-                    content = f.readlines()
-                    logs.extend(content[-lines:])
+                logs.extend(_tail_lines(file, lines))
         except Exception as e:
             logs.append(f"Error reading {file}: {str(e)}")
     
     return "".join(logs)
 
+# Checks the daemon first, then prints the container id (empty if not running).
+# A missing CLI exits 127; an unreachable daemon prints the sentinel instead.
+NO_DAEMON_SENTINEL = "__NO_DAEMON__"
+DOCKER_CHECK_SCRIPT = f"""
+docker info >/dev/null
+status=$?
+[ $status -eq 127 ] && exit 127
+[ $status -ne 0 ] && {{ echo {NO_DAEMON_SENTINEL}; exit 0; }}
+exec docker-compose ps -q letta-server
+"""
+
 def check_docker_status() -> Tuple[bool, str, Optional[str], Optional[str]]:
     """Check if the Letta Docker container is running."""
+    # Ask the Engine API directly when the socket is usable; it skips the CLI startup cost
+    if docker_api.socket_available():
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            project = docker_api.compose_project_name(project_root)
+            if not docker_api.list_service_containers('letta-server', project):
+                return False, "Docker container status", "container_not_running", "Container not found"
+            return True, "Docker container status", None, None
+        except (OSError, RuntimeError, ValueError, http.client.HTTPException):
+            # Daemon unreachable or unexpected answer; the CLI check diagnoses it
+            pass
+    return _check_docker_status_cli()
+
+def _check_docker_status_cli() -> Tuple[bool, str, Optional[str], Optional[str]]:
+    """Check the Letta Docker container through the docker and docker-compose CLIs."""
     try:
-        # First check if Docker daemon is running
-        daemon_check = subprocess.run(['docker', 'info'], capture_output=True, text=True)
-        if daemon_check.returncode != 0:
-            return False, "Docker daemon status", "daemon_not_running", daemon_check.stderr
-            
+        # One shell runs both Docker CLI calls, saving a process spawn per check
         result = subprocess.run(
-            ['docker-compose', 'ps', '-q', 'letta-server'],
+            ['sh', '-c', DOCKER_CHECK_SCRIPT],
             capture_output=True,
             text=True,
             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         )
-        if not result.stdout.strip():
+        if result.returncode == 127:
+            # docker or docker-compose is not installed
+            return False, f"Docker error: {result.stderr.strip()}", "docker_error", result.stderr
+        output = result.stdout.strip()
+        if output == NO_DAEMON_SENTINEL:
+            return False, "Docker daemon status", "daemon_not_running", result.stderr
+        if not output:
             return False, "Docker container status", "container_not_running", "Container not found"
         return True, "Docker container status", None, None
     except Exception as e:
         return False, f"Docker error: {str(e)}", "docker_error", str(e)
 
+# Pooled keep-alive connections for the health check, shared by every call in the process
+HTTP_SESSION = requests.Session()
+
 def check_server_health() -> Tuple[bool, str, Optional[str], Optional[str]]:
     """Check if the Letta server health endpoint is responding."""
     try:
-        response = requests.get('http://localhost:8284', timeout=5)
+        response = HTTP_SESSION.get('http://localhost:8284', timeout=5)
         if response.status_code != 200:
             return False, "Server health check", "unhealthy_response", f"Status code: {response.status_code}"
         return True, "Server health check", None, None
@@ -133,14 +199,22 @@ def check_gemini_config() -> Tuple[bool, str, Optional[str], Optional[str]]:
     """Check if Gemini API key is configured."""
     env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
     try:
-        with open(env_path, 'r') as f:
-            content = f.read()
-            if 'GEMINI_API_KEY' not in content:
-                return False, "Gemini API key configuration", "key_missing", "API key not found in .env"
-            return True, "Gemini API key configuration", None, None
+        # An empty file cannot be mapped, and cannot hold the key either
+        found = False
+        if os.path.getsize(env_path) > 0:
+            with open(env_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                found = mm.find(b'GEMINI_API_KEY') != -1
+        if not found:
+            return False, "Gemini API key configuration", "key_missing", "API key not found in .env"
+        return True, "Gemini API key configuration", None, None
     except Exception as e:
         return False, f"Gemini config error: {str(e)}", "config_error", str(e)
 
+@functools.lru_cache(maxsize=None)
+def _dir_writable(path: str) -> bool:
+    """Check directory write access once per directory; both logs share one."""
+    return os.access(path, os.W_OK)
+
 def check_log_files() -> List[Tuple[bool, str, Optional[str], Optional[str]]]:
     """Check if log files exist and are writable."""
     log_files = [
@@ -149,8 +223,13 @@ def check_log_files() -> List[Tuple[bool, str, Optional[str], Optional[str]]]:
     ]
     results = []
     for log_file in log_files:
-        exists = os.path.exists(log_file)
-        writable = os.access(os.path.dirname(log_file), os.W_OK) if exists else False
+        # One stat per file; missing or unreadable paths count as absent, like os.path.exists
+        try:
+            os.stat(log_file)
+            exists = True
+        except (OSError, ValueError):
+            exists = False
+        writable = _dir_writable(os.path.dirname(log_file)) if exists else False
         status = "OK" if exists and writable else "Missing or not writable"
         error_code = None if exists and writable else "log_file_error"
         error_details = None if exists and writable else f"File: {log_file}, Exists: {exists}, Writable: {writable}"
@@ -179,14 +258,17 @@ async def main():
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     repairer = LettaRepair(project_root)
     
-    # Run all checks
-    checks = [
-        check_docker_status(),
-        check_server_health(),
-        check_gemini_config(),
-        check_autostart(),
-        *check_log_files()
-    ]
+    # Run all checks; they are independent and mostly wait on subprocesses or
+    # the network, so run them side by side on the default executor
+    loop = asyncio.get_running_loop()
+    docker, health, gemini, autostart, log_files = await asyncio.gather(
+        loop.run_in_executor(None, check_docker_status),
+        loop.run_in_executor(None, check_server_health),
+        loop.run_in_executor(None, check_gemini_config),
+        loop.run_in_executor(None, check_autostart),
+        loop.run_in_executor(None, check_log_files)
+    )
+    checks = [docker, health, gemini, autostart, *log_files]
     
     # Prepare results for AI analysis
     check_results = []
@@ -206,39 +288,36 @@ async def main():
         })
         
         # Attempt repairs for failed checks
-        if not passed and error_code:
+        if passed or not error_code:
+            continue
+        
+        if error_code == "log_file_error":
             repairs_attempted = True
             print(f"  🔧 Attempting repair...")
-            
-            # Get AI recommendation first
-            if error_details:
-                ai_suggestion = await repairer.get_ai_recommendation(f"{message}: {error_details}")
-                print(f"  🤖 AI Recommendation:\n{ai_suggestion}\n")
-            
-            if error_code == "daemon_not_running":
-                success = repairer.start_docker_daemon()
-                repairer.log_repair("Docker", "Start daemon", success)
-                if success:
-                    print("  ✅ Started Docker daemon")
-                    
-            elif error_code in ["container_not_running", "connection_failed", "unhealthy_response"]:
-                success = repairer.restart_docker_container()
-                repairer.log_repair("Docker", "Restart container", success)
-                if success:
-                    print("  ✅ Restarted Docker container")
-                    
-            elif error_code == "log_file_error":
-                log_file = message.split(": ")[0].replace("Log file ", "")
-                success = repairer.fix_log_permissions(os.path.expanduser(f"~/Library/Logs/{log_file}"))
-                repairer.log_repair("Logs", f"Fix permissions for {log_file}", success)
-                if success:
-                    print("  ✅ Fixed log file permissions")
-                    
-            elif error_code in ["plist_missing", "not_loaded", "autostart_error"]:
-                success = repairer.reload_launch_agent()
-                repairer.log_repair("LaunchAgent", "Reload configuration", success)
-                if success:
-                    print("  ✅ Reloaded launch agent")
+            log_file = message.split(": ")[0].replace("Log file ", "")
+            success = repairer.fix_log_permissions(os.path.expanduser(f"~/Library/Logs/{log_file}"))
+            repairer.log_repair("Logs", f"Fix permissions for {log_file}", success)
+            if success:
+                print("  ✅ Fixed log file permissions")
+            continue
+        
+        # Only codes with a registered repair are worth an AI recommendation round trip
+        repair = REPAIR_TABLE.get(error_code)
+        if repair is None:
+            continue
+        repair_method, component, action, success_message = repair
+        repairs_attempted = True
+        print(f"  🔧 Attempting repair...")
+        
+        # Get AI recommendation first
+        if error_details:
+            ai_suggestion = await repairer.get_ai_recommendation(f"{message}: {error_details}")
+            print(f"  🤖 AI Recommendation:\n{ai_suggestion}\n")
+        
+        success = repair_method(repairer)
+        repairer.log_repair(component, action, success)
+        if success:
+            print(f"  ✅ {success_message}")
     
     # Get comprehensive AI analysis if there were any issues
     if not all_passed:
@@ -3,6 +3,23 @@ import os
 import sys
 import json
 import re
+import functools
+
+# Compiled once at import; re.ASCII also keeps \d in the port to ASCII digits
+_GEMINI_KEY_RE = re.compile(r'^[A-Za-z0-9_-]{39,}$', re.ASCII)
+_SERVER_URL_RE = re.compile(r'^https?://[a-zA-Z0-9.-]+(?::\d+)?$', re.ASCII)
+
+@functools.lru_cache(maxsize=8)
+def _parse_env(path, mtime_ns):
+    """Parse KEY=value lines from an env file; mtime_ns only keys the cache"""
+    env_vars = {}
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                key, value = line.split('=', 1)
+                env_vars[key] = value
+    return env_vars
 
 class LettaEnvironmentConfigurator:
     def __init__(self):
@@ -11,26 +28,21 @@ class LettaEnvironmentConfigurator:
     
     def _load_current_env(self):
         """Load existing environment variables"""
-        env_vars = {}
-        if os.path.exists(self.env_path):
-            with open(self.env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        key, value = line.split('=', 1)
-                        env_vars[key] = value
-        return env_vars
+        try:
+            mtime_ns = os.stat(self.env_path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        # Copy so edits to current_env never leak into the cached parse
+        return dict(_parse_env(self.env_path, mtime_ns))
     
     def _validate_gemini_api_key(self, key):
         """Validate Google Gemini API key format"""
         # Basic validation for API key format
-        pattern = r'^[A-Za-z0-9_-]{39,}$'
-        return re.match(pattern, key) is not None
+        return _GEMINI_KEY_RE.match(key) is not None
     
     def _validate_server_url(self, url):
         """Validate server URL format"""
-        pattern = r'^https?://[a-zA-Z0-9.-]+(?::\d+)?$'
-        return re.match(pattern, url) is not None
+        return _SERVER_URL_RE.match(url) is not None
     
     def recommend_gemini_api_key(self):
         """Recommend ways to obtain a Gemini API key"""
@@ -125,12 +137,26 @@ class LettaEnvironmentConfigurator:
         # Add a timestamp
         self.current_env['LETTA_TIMESTAMP'] = '2025-03-14T21:27:48-06:00'
         
-        # Write to file
-        with open(self.env_path, 'w') as f:
-            for key, value in self.current_env.items():
-                f.write(f"{key}={value}\n")
-        
-        print("\n✅ Environment configuration saved successfully!")
+        # Skip the write when the file already holds exactly these values
+        if self.current_env == self._load_current_env():
+            print("\n✅ Environment configuration already up to date!")
+        else:
+            # Write a temp file and rename it over the target, so a crash never leaves a partial file
+            content = "".join(f"{key}={value}\n" for key, value in self.current_env.items())
+            tmp_path = f"{self.env_path}.tmp"
+            # The file holds the API key: keep the existing file's permissions, owner-only for a new one
+            try:
+                mode = os.stat(self.env_path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o600
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.env_path)
+            print("\n✅ Environment configuration saved successfully!")
         print(f"Configuration file: {self.env_path}")
         
         # Display saved configuration
@@ -32,10 +32,10 @@ GEMINI_AGENT = {
     "system_prompt": "You are GeminiAssistant, a helpful AI powered by Google Gemini. Answer questions accurately and concisely."
 }
 
-def check_server():
+def check_server(session):
     """Check if Letta server is running"""
     try:
-        response = requests.get(f"{LETTA_URL}/api/health", timeout=5)
+        response = session.get(f"{LETTA_URL}/api/health", timeout=5)
         if response.status_code == 200:
             print("✅ Letta server is running")
             return True
@@ -46,19 +46,19 @@ def check_server():
         print(f"❌ Could not connect to Letta server: {e}")
         return False
 
-def check_first_time_setup():
+def check_first_time_setup(session):
     """Check if this is first-time setup"""
     try:
-        response = requests.get(f"{LETTA_URL}/api/setup/status")
+        response = session.get(f"{LETTA_URL}/api/setup/status")
         return response.json().get("needs_setup", False)
     except:
         return False
 
-def create_admin_account():
+def create_admin_account(session):
     """Create the admin account for first-time setup"""
     try:
         print("🔧 Creating admin account...")
-        response = requests.post(
+        response = session.post(
             f"{LETTA_URL}/api/setup/admin",
             json=DEFAULT_ADMIN
         )
@@ -72,10 +72,10 @@ def create_admin_account():
         print(f"❌ Error creating admin account: {e}")
         return None
 
-def login(credentials):
+def login(session, credentials):
     """Login to Letta and get auth token"""
     try:
-        response = requests.post(
+        response = session.post(
             f"{LETTA_URL}/api/auth/login",
             json={
                 "username": credentials["username"],
@@ -93,11 +93,11 @@ def login(credentials):
         print(f"❌ Error during login: {e}")
         return None
 
-def create_agent(token):
+def create_agent(session, token):
     """Create a Gemini-powered agent"""
     try:
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.post(
+        response = session.post(
             f"{LETTA_URL}/api/agents",
             json=GEMINI_AGENT,
             headers=headers
@@ -117,15 +117,18 @@ def main():
     """Main execution function"""
     print("🚀 Starting Letta Gemini Agent Setup")
     
+    # One session for the whole setup, so every step reuses the same connection
+    session = requests.Session()
+    
     # Check server status
-    if not check_server():
+    if not check_server(session):
         print("❌ Letta server is not accessible. Please make sure it's running.")
         sys.exit(1)
     
     # Check if first-time setup is needed
-    if check_first_time_setup():
+    if check_first_time_setup(session):
         print("🔧 First-time setup required")
-        credentials = create_admin_account()
+        credentials = create_admin_account(session)
         if not credentials:
             print("❌ Failed to complete first-time setup")
             sys.exit(1)
@@ -134,13 +137,13 @@ def main():
         print("✅ Letta server already set up")
     
     # Login
-    token = login(credentials)
+    token = login(session, credentials)
     if not token:
         print("❌ Failed to authenticate")
         sys.exit(1)
     
     # Create agent
-    agent_id = create_agent(token)
+    agent_id = create_agent(session, token)
     if not agent_id:
         print("❌ Failed to create Gemini agent")
         sys.exit(1)
@@ -7,103 +7,99 @@ This script creates a Gemini agent directly using the Letta API endpoints.
 import os
 import sys
 import json
-import requests
 import argparse
-from pathlib import Path
-from dotenv import load_dotenv
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.gemini_integration import GeminiAPI, create_letta_agent_config
-
-# Load environment variables
-env_path = os.path.expanduser("~/.letta/env")
-if os.path.exists(env_path):
-    load_dotenv(env_path)
+from scripts._agent_endpoints import agent_retry, try_endpoints
 
 # Default configurations
 DEFAULT_LETTA_URL = "http://localhost:8283"
 DEFAULT_CONFIG_PATH = "/var/folders/dx/mg3zn87d7v180d9knyk2mx8r0000gn/T/letta_agent_GeminiAssistant_qgzm0_cs.json"
 
+# API endpoint patterns for the agents collection, in preference order
+AGENT_ENDPOINTS = (
+    "/api/agents",
+    "/api/v1/agents",
+    "/agents",
+    "/api/agent",
+    "/api/v1/agent"
+)
+
+# Run inside the Letta container by the Docker fallback; reads the agent config from stdin
+DOCKER_CREATE_AGENT_SCRIPT = (
+    "import sys, json; "
+    "from letta.server.api.agents import create_agent; "
+    "print(create_agent(json.load(sys.stdin)))"
+)
+
 class LettaAPIClient:
     """Client for interacting with Letta API"""
     
+    # Keep-alive connections held per host; enough for every endpoint probe at once
+    POOL_SIZE = 8
+    
     def __init__(self, base_url=DEFAULT_LETTA_URL):
+        # Imported here so --help and argument errors don't pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        
         self.base_url = base_url
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=agent_retry()
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Session defaults already include "Connection: keep-alive"; every request sends JSON
+        self.session.headers.update({"Content-Type": "application/json"})
+    
+    @staticmethod
+    def _report_attempt(url, outcome):
+        """Print the result of trying one endpoint"""
+        print(f"Trying endpoint: {url}")
+        if isinstance(outcome, Exception):
+            print(f"  Error: {str(outcome)}")
+        elif outcome.status_code not in (200, 201):
+            print(f"  Status: {outcome.status_code}")
+            try:
+                print(f"  Response: {outcome.json()}")
+            except:
+                print(f"  Response: {outcome.text[:100]}")
+    
+    def _try_endpoints(self, method, success_statuses=(200,), **kwargs):
+        """Send a request to the first agents endpoint that serves it; None if none did"""
+        try:
+            return try_endpoints(
+                self.session, method, self.base_url, AGENT_ENDPOINTS, timeout=10,
+                success_statuses=success_statuses, on_attempt=self._report_attempt, **kwargs
+            )
+        except Exception:
+            # No endpoint was reachable; each failure has already been reported
+            return None
     
     def create_agent(self, config):
         """Create a new agent using various API endpoint patterns"""
-        
-        # Try different API endpoint patterns
-        endpoints = [
-            "/api/agents",
-            "/api/v1/agents",
-            "/agents",
-            "/api/agent",
-            "/api/v1/agent"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                url = f"{self.base_url}{endpoint}"
-                print(f"Trying endpoint: {url}")
-                
-                response = self.session.post(
-                    url,
-                    json=config,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if response.status_code in (200, 201):
-                    return {"success": True, "data": response.json(), "endpoint": endpoint}
-                else:
-                    print(f"  Status: {response.status_code}")
-                    try:
-                        print(f"  Response: {response.json()}")
-                    except:
-                        print(f"  Response: {response.text[:100]}")
-            except Exception as e:
-                print(f"  Error: {str(e)}")
-        
-        return {"success": False, "error": "Failed to create agent with all attempted API endpoints."}
+        found = self._try_endpoints("POST", success_statuses=(200, 201), json=config)
+        if found is None:
+            return {"success": False, "error": "Failed to create agent with all attempted API endpoints."}
+        endpoint, response = found
+        return {"success": True, "data": response.json(), "endpoint": endpoint}
     
     def list_agents(self):
         """List all agents"""
-        
-        # Try different API endpoint patterns
-        endpoints = [
-            "/api/agents",
-            "/api/v1/agents",
-            "/agents",
-            "/api/agent",
-            "/api/v1/agent"
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                url = f"{self.base_url}{endpoint}"
-                print(f"Trying endpoint: {url}")
-                
-                response = self.session.get(
-                    url,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json(), "endpoint": endpoint}
-                else:
-                    print(f"  Status: {response.status_code}")
-                    try:
-                        print(f"  Response: {response.json()}")
-                    except:
-                        print(f"  Response: {response.text[:100]}")
-            except Exception as e:
-                print(f"  Error: {str(e)}")
-        
-        return {"success": False, "error": "Failed to list agents with all attempted API endpoints."}
+        found = self._try_endpoints("GET")
+        if found is None:
+            return {"success": False, "error": "Failed to list agents with all attempted API endpoints."}
+        endpoint, response = found
+        return {"success": True, "data": response.json(), "endpoint": endpoint}
+
+def load_agent_config(path):
+    """Load an agent configuration from a JSON file"""
+    with open(path, 'r') as f:
+        return json.load(f)
 
 def main():
     parser = argparse.ArgumentParser(description="Create Gemini Agent via Letta API")
@@ -113,6 +109,12 @@ def main():
     
     args = parser.parse_args()
     
+    # Load environment variables (deferred until the arguments are known to be valid)
+    from dotenv import load_dotenv
+    env_path = os.path.expanduser("~/.letta/env")
+    if os.path.isfile(env_path):
+        load_dotenv(env_path)
+    
     # Initialize Letta API client
     client = LettaAPIClient(base_url=args.letta_url)
     
@@ -137,9 +139,8 @@ def main():
     
     # Load configuration
     try:
-        with open(args.config, 'r') as f:
-            config = json.load(f)
-            print(f"Loaded configuration for agent: {config.get('name')}")
+        config = load_agent_config(args.config)
+        print(f"Loaded configuration for agent: {config.get('name')}")
     except Exception as e:
         print(f"❌ Failed to load configuration: {e}")
         return 1
@@ -162,14 +163,14 @@ def main():
         try:
             import subprocess
             
-            # Convert config to escaped JSON string
-            config_str = json.dumps(config).replace('"', '\\"')
-            
-            # Create Docker command
-            docker_cmd = f'docker exec letta-server bash -c "echo \'{config_str}\' > /tmp/agent_config.json && cd /app && python -c \"from letta.server.api.agents import create_agent; import json; with open(\'/tmp/agent_config.json\') as f: config = json.load(f); print(create_agent(config))\""'
+            # The config goes in on stdin, so it needs no shell quoting or temp file
+            docker_cmd = [
+                "docker", "exec", "-i", "-w", "/app", "letta-server",
+                "python", "-c", DOCKER_CREATE_AGENT_SCRIPT
+            ]
             
             print(f"Running Docker command...")
-            result = subprocess.run(docker_cmd, shell=True, capture_output=True, text=True)
+            result = subprocess.run(docker_cmd, input=json.dumps(config), capture_output=True, text=True)
             
             if result.returncode == 0:
                 print("\n✅ Successfully created agent using Docker exec approach!")
@@ -8,8 +8,10 @@ import os
 import sys
 import json
 import logging
-import requests
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
+
+if TYPE_CHECKING:
+    import requests
 
 # Configure logging
 logging.basicConfig(
@@ -18,22 +20,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger("letta_agent_creator")
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.gemini_integration import create_letta_agent_config, GeminiAPI
+# Running as a script puts scripts/ instead of the project root on sys.path;
+# package imports (python -m ...) resolve through the normal finders
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts._agent_endpoints import agent_retry, try_endpoints
+
+# Agent API endpoint patterns, in the order each operation tries them
+CREATE_ENDPOINTS = (
+    "/api/agent",
+    "/api/agents",
+    "/api/v1/agent",
+    "/api/v1/agents"
+)
+LIST_ENDPOINTS = (
+    "/api/agents",
+    "/api/agent",
+    "/api/v1/agents",
+    "/api/v1/agent"
+)
 
 class LettaAgentCreator:
     """Tool for creating and managing agents in the Letta ADE"""
     
-    def __init__(self, letta_url: str = "http://localhost:8283"):
-        """Initialize with Letta server URL"""
+    # Keep-alive connections held per host; sized so concurrent agent creations
+    # each reuse a pooled connection instead of opening a new one
+    POOL_SIZE = 16
+    REQUEST_TIMEOUT = 30
+    
+    def __init__(self, letta_url: str = "http://localhost:8283", session: Optional['requests.Session'] = None):
+        """
+        Initialize with Letta server URL
+        
+        :param letta_url: URL of the Letta server
+        :param session: Existing session to share connections with; its adapters are kept as-is
+        """
+        # requests is imported on first use so --help and argument errors stay fast
+        import requests
+        from requests.adapters import HTTPAdapter
+        
         self.letta_url = letta_url.rstrip('/')
-        self.session = requests.Session()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.POOL_SIZE, max_retries=agent_retry())
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
         self.auth_token = None
         
         # Test connection
         try:
-            response = self.session.get(f"{self.letta_url}/")
+            response = self.session.get(f"{self.letta_url}/", timeout=self.REQUEST_TIMEOUT)
             if response.status_code == 200:
                 logger.info(f"Successfully connected to Letta server at {letta_url}")
             else:
@@ -47,7 +84,8 @@ class LettaAgentCreator:
         try:
             response = self.session.post(
                 f"{self.letta_url}/api/auth/login",
-                json={"username": username, "password": password}
+                json={"username": username, "password": password},
+                timeout=self.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -77,6 +115,9 @@ class LettaAgentCreator:
     ) -> Dict[str, Any]:
         """Create a new Gemini-powered chat agent"""
         
+        # gemini_integration pulls in the Gemini SDK, so it is only imported when needed
+        from scripts.gemini_integration import create_letta_agent_config
+        
         # Generate agent configuration
         agent_config = create_letta_agent_config(
             name=name,
@@ -90,23 +131,17 @@ class LettaAgentCreator:
         # Create the agent
         try:
             # Try different API endpoints since the exact path might vary
-            endpoints = [
-                f"{self.letta_url}/api/agent",
-                f"{self.letta_url}/api/agents",
-                f"{self.letta_url}/api/v1/agent",
-                f"{self.letta_url}/api/v1/agents"
-            ]
-            
-            success = False
-            for endpoint in endpoints:
-                response = self.session.post(endpoint, json=agent_config)
-                if response.status_code in (200, 201):
-                    agent_data = response.json()
-                    logger.info(f"Successfully created agent: {name}")
-                    return {
-                        "success": True,
-                        "agent": agent_data
-                    }
+            found = try_endpoints(
+                self.session, "POST", self.letta_url, CREATE_ENDPOINTS, timeout=self.REQUEST_TIMEOUT,
+                success_statuses=(200, 201), json=agent_config
+            )
+            if found is not None:
+                agent_data = found[1].json()
+                logger.info(f"Successfully created agent: {name}")
+                return {
+                    "success": True,
+                    "agent": agent_data
+                }
             
             # If we get here, all endpoints failed
             logger.error(f"Failed to create agent. Tried multiple endpoints.")
@@ -126,21 +161,13 @@ class LettaAgentCreator:
         """List all agents in the Letta ADE"""
         try:
             # Try multiple possible endpoints
-            endpoints = [
-                f"{self.letta_url}/api/agents",
-                f"{self.letta_url}/api/agent",
-                f"{self.letta_url}/api/v1/agents",
-                f"{self.letta_url}/api/v1/agent"
-            ]
-            
-            for endpoint in endpoints:
-                response = self.session.get(endpoint)
-                if response.status_code == 200:
-                    agents = response.json()
-                    return {
-                        "success": True,
-                        "agents": agents
-                    }
+            found = try_endpoints(self.session, "GET", self.letta_url, LIST_ENDPOINTS, timeout=self.REQUEST_TIMEOUT)
+            if found is not None:
+                agents = found[1].json()
+                return {
+                    "success": True,
+                    "agents": agents
+                }
             
             # Gracefully handle case when no endpoints work
             logger.info("No agents found or agents endpoint not available")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Minimal Docker Engine API client over the local unix socket.
+Lets status checks query containers without spawning the docker CLI.
+"""
+import os
+import re
+import json
+import socket
+import http.client
+from urllib.parse import quote
+from typing import Any, Dict, List
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection that talks to a unix socket instead of a TCP host"""
+
+    def __init__(self, socket_path: str, timeout: float = 5):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+def socket_available(socket_path: str = DOCKER_SOCKET) -> bool:
+    """Check whether the Docker socket exists and can be opened for reading and writing"""
+    return os.access(socket_path, os.R_OK | os.W_OK)
+
+def compose_project_name(project_dir: str) -> str:
+    """
+    Get the compose project name docker-compose uses when run from a directory
+
+    :param project_dir: Directory holding docker-compose.yml
+    :return: COMPOSE_PROJECT_NAME if set, otherwise the normalized directory name
+    """
+    name = os.environ.get("COMPOSE_PROJECT_NAME")
+    if name:
+        return name
+    return re.sub(r"[^a-z0-9_-]", "", os.path.basename(os.path.abspath(project_dir)).lower())
+
+def list_service_containers(service: str, project: str, socket_path: str = DOCKER_SOCKET) -> List[Dict[str, Any]]:
+    """
+    List running containers of a docker-compose service
+
+    :param service: Compose service name, matched through the compose service label
+    :param project: Compose project name, matched through the compose project label
+    :param socket_path: Path of the Docker Engine socket
+    :return: Container summaries as returned by /containers/json
+    :raises OSError: If the daemon cannot be reached
+    :raises RuntimeError: If the daemon answers with an error status
+    """
+    # Both labels, like `docker-compose ps` run from the project directory
+    filters = json.dumps({"label": [
+        f"com.docker.compose.project={project}",
+        f"com.docker.compose.service={service}"
+    ]})
+    conn = UnixHTTPConnection(socket_path)
+    try:
+        conn.request("GET", f"/containers/json?filters={quote(filters)}")
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"Docker API returned {response.status}: {body.decode('utf-8', 'replace')}")
+    return json.loads(body)
@@ -11,9 +11,50 @@ import platform
 import socket
 import uuid
 import json
-import subprocess
+import functools
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    """Encode one compact JSON line; orjson when available, json otherwise"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Environment log entries kept after a trim, and the file size that triggers one
+LOG_MAX_ENTRIES = 100
+LOG_TRIM_BYTES = 512 * 1024
+
+@functools.lru_cache(maxsize=None)
+def _git_branch(project_root: str) -> str:
+    """Look up the current Git branch of a repository once per process."""
+    # Read HEAD directly to avoid forking git; a detached HEAD reads as "HEAD" like rev-parse
+    try:
+        with open(os.path.join(project_root, '.git', 'HEAD'), 'r') as f:
+            head = f.read().strip()
+        if head.startswith('ref: refs/heads/'):
+            return head[len('ref: refs/heads/'):]
+        return 'HEAD'
+    except OSError:
+        # Worktrees and submodules keep .git as a file; let git resolve those
+        pass
+    
+    import subprocess
+    try:
+        branch = subprocess.check_output(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"], 
+            cwd=project_root,
+            text=True
+        ).strip()
+        return branch
+    except Exception as e:
+        return f"unknown (Error: {str(e)})"
 
 class DeviceEnvironment:
     def __init__(self):
@@ -75,46 +116,37 @@ class DeviceEnvironment:
     
     def get_git_branch(self) -> str:
         """Retrieve current Git branch with error handling."""
-        try:
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            branch = subprocess.check_output(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"], 
-                cwd=project_root
-            ).decode().strip()
-            return branch
-        except Exception as e:
-            return f"unknown (Error: {str(e)})"
+        return _git_branch(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
-    def log_environment(self) -> Dict[str, Any]:
+    def log_environment(self, info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Log environment information with advanced tracking."""
-        info = self.get_system_info()
-        log_file = os.path.expanduser('~/Library/Logs/windsurf_device_sync.json')
+        if info is None:
+            info = self.get_system_info()
+        log_file = os.path.expanduser('~/Library/Logs/windsurf_device_sync.jsonl')
         
         # Ensure log directory exists
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         
-        # Read existing logs or create new
-        try:
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            logs = []
-        
-        # Add current environment
-        logs.append(info)
-        
-        # Keep only last 100 entries
-        logs = logs[-100:]
+        # One JSON object per line, so logging appends instead of rewriting the whole history
+        with open(log_file, 'ab') as f:
+            f.write(_dumps(info) + b'\n')
+            size = f.tell()
         
-        # Write updated logs
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        # Trim back to the last entries only once the file has grown well past them
+        if size > LOG_TRIM_BYTES:
+            with open(log_file, 'rb') as f:
+                entries = deque(f, maxlen=LOG_MAX_ENTRIES)
+            tmp_file = f"{log_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.writelines(entries)
+            os.replace(tmp_file, log_file)
         
         return info
     
-    def display_environment(self) -> None:
+    def display_environment(self, info: Optional[Dict[str, Any]] = None) -> None:
         """Display current environment information with device-specific details."""
-        info = self.get_system_info()
+        if info is None:
+            info = self.get_system_info()
         
         print("\n🖥️  Windsurf Cross-Device Environment 🖥️")
         print("=" * 50)
@@ -127,19 +159,25 @@ class DeviceEnvironment:
         print(f"Timestamp: {info['timestamp']}")
         print("=" * 50)
     
-    def sync_project(self) -> None:
+    def sync_project(self, fetch: bool = False) -> None:
         """
         Synchronize project across devices using Git and environment tracking.
         Provides recommendations for maintaining consistency.
+        
+        Divergence is reported against the last fetched state of origin unless
+        fetch is set, which updates it first over the network.
         """
+        import subprocess
+        
         try:
-            # Fetch latest changes
-            subprocess.run(["git", "fetch", "origin"], check=True)
+            # Fetch latest changes only on request; it is a network round trip that can take seconds
+            if fetch:
+                subprocess.run(["git", "fetch", "origin"], check=True)
             
             # Check for divergence
             status = subprocess.check_output(
                 ["git", "status", "-sb"], 
-                universal_newlines=True
+                text=True
             )
             
             print("\n🔄 Project Synchronization Status:")
@@ -154,16 +192,27 @@ class DeviceEnvironment:
             if "ahead" in status:
                 print("\n⚠️  Recommendation: Push your changes")
                 print("   Run: git push origin main")
+            
+            if not fetch:
+                print("\nℹ️  Compared with the last fetch; run with --fetch to check origin now")
         
         except subprocess.CalledProcessError as e:
             print(f"Sync error: {e}")
 
 def main():
     """Main execution point for environment tracking."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Track and sync the development environment across devices")
+    parser.add_argument("--fetch", action="store_true",
+                        help="Fetch from origin before reporting sync status (network access)")
+    args = parser.parse_args()
+    
     env_tracker = DeviceEnvironment()
-    env_tracker.log_environment()
-    env_tracker.display_environment()
-    env_tracker.sync_project()
+    # Collect once; logging and display show the same snapshot
+    info = env_tracker.log_environment()
+    env_tracker.display_environment(info)
+    env_tracker.sync_project(fetch=args.fetch)
 
 if __name__ == '__main__':
     main()
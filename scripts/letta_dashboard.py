@@ -14,7 +14,6 @@ import webbrowser
 from dotenv import load_dotenv
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import threading
-import time
 from typing import Dict, List, Any
 import socket
 
@@ -650,10 +649,9 @@ def run_dashboard(letta_url="http://localhost:8283", port=None):
     # Open browser
     webbrowser.open(f"{url}?letta_url={letta_url}")
     
-    # Wait for keyboard interrupt
+    # Block until the server thread exits or Ctrl+C, without waking up to poll
     try:
-        while True:
-            time.sleep(1)
+        server_thread.join()
     except KeyboardInterrupt:
         logger.info("Stopping server...")
         httpd.shutdown()